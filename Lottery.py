@@ -1,5 +1,12 @@
+# ruff: noqa: E402
+import time
+
+startup_time = time.perf_counter()  # 启动时间, --profile-startup 统计导入耗时
+
 import os
 import random
+import sys
+import unicodedata
 
 
 def read_names():
@@ -8,15 +15,213 @@ def read_names():
     file_path = "lottery.txt"
     if not os.path.exists(file_path):
         return []
+    names = []
     with open(file_path, encoding="utf-8") as file:
-        names = file.readlines()
-    return [name.strip() for name in names]
+        for line in file:
+            # 整理后的名单每行为 "ID\t姓名", 显示为 "ID 姓名"; 没有ID的行直接作为名字, 跳过空行
+            person_id, sep, name = line.strip().partition("\t")
+            if sep:
+                names.append(f"{person_id} {name}")
+            elif person_id:
+                names.append(person_id)
+    return names
+
+
+HEADER_ID_WORDS = {"id", "工号", "编号", "员工编号", "序号"}  # 表头中ID列的名称
+HEADER_NAME_WORDS = {"name", "姓名", "名字", "员工姓名"}  # 表头中姓名列的名称
+
+
+def prepare_roster(input_files, output_file="lottery.txt", report_file="lottery_duplicates.txt"):
+    """
+    合并多个名单文件, NFKC规范化(全角转半角等)并合并空白后去重, 写出 "ID\t姓名" 格式的名单和重复报告
+    输入每行为 "姓名" 或 "ID<tab或逗号>姓名[<tab或逗号>其他列]", 只取前两列, 跳过"工号,姓名"之类的表头行
+    逗号前不含数字时整行作为姓名(如 "Smith, John"), tab分隔的行总是拆分
+    有ID时按ID和姓名去重, 否则按规范化后的姓名去重(不区分大小写); 没有ID的人按顺序分配数字ID, 跳过已使用的ID
+    报告每行为 "ID\t姓名\t出现次数\t出现位置\t类型", 类型为:
+    - 重复: 同一个人出现多次, 只保留一次
+    - ID冲突: 同一个ID对应不同姓名, 都保留在名单中, 姓名列为所有姓名, 需人工确认
+    - 无ID同名: 无ID的行与有ID的人同名, 都保留在名单中, 需人工确认
+    """
+    roster = {}  # 去重键 -> [ID, 姓名, 首次出现的文件, 行号]
+    duplicates = {}  # 去重键 -> 所有出现位置
+    for file_path in input_files:
+        with open(file_path, encoding="utf-8-sig") as file:
+            for line_no, raw_line in enumerate(file, 1):
+                # 全角逗号, 全角空格等先转成半角再拆分
+                line = raw_line if raw_line.isascii() else unicodedata.normalize("NFKC", raw_line)
+                if "\t" in line:
+                    person_id, name = line.split("\t", 2)[:2]
+                else:
+                    person_id, sep, rest = line.partition(",")
+                    if sep and (any(c.isdigit() for c in person_id) or person_id.strip().casefold() in HEADER_ID_WORDS):
+                        name = rest.partition(",")[0]
+                    else:
+                        person_id, name = "", line
+                person_id = " ".join(person_id.split())
+                name = " ".join(name.split())
+                if not name:
+                    continue
+                if person_id.casefold() in HEADER_ID_WORDS and name.casefold() in HEADER_NAME_WORDS:
+                    continue  # 表头, 合并多份导出时可能出现在文件中间
+                if not person_id and line_no == 1 and name.casefold() in HEADER_NAME_WORDS:
+                    continue  # 只有姓名一列的表头
+                # 姓名中的空白已合并为单个空格, 不含tab, 可以作为分隔符
+                key = f"id:{person_id.casefold()}\t{name.casefold()}" if person_id else "name:" + name.casefold()
+                entry = roster.get(key)
+                if entry is None:
+                    roster[key] = [person_id, name, file_path, line_no]
+                elif key in duplicates:
+                    duplicates[key].append(f"{file_path}:{line_no}")
+                else:
+                    duplicates[key] = [f"{entry[2]}:{entry[3]}", f"{file_path}:{line_no}"]
+
+    def positions(key):
+        entry = roster[key]
+        return duplicates.get(key) or [f"{entry[2]}:{entry[3]}"]
+
+    id_keys = {}  # ID(不区分大小写) -> 该ID下不同姓名的去重键
+    id_entries = {}  # 姓名(不区分大小写) -> 有ID的去重键
+    for key, entry in roster.items():
+        if entry[0]:
+            id_keys.setdefault(entry[0].casefold(), []).append(key)
+            id_entries.setdefault(entry[1].casefold(), []).append(key)
+    # 同一个ID对应不同姓名时, 无法判断哪一个正确, 都保留并写入报告
+    conflicts = [keys for keys in id_keys.values() if len(keys) > 1]
+    # 无ID的行与有ID的人同名时, 可能是同一个人, 也可能是同名的两个人, 保留两者并写入报告
+    suspects = {}  # 无ID条目的去重键 -> 所有出现位置(包括同名的有ID条目)
+    for key, entry in roster.items():
+        if not entry[0] and entry[1].casefold() in id_entries:
+            others = id_entries[entry[1].casefold()]
+            suspects[key] = positions(key) + [place for other in others for place in positions(other)]
+
+    used_ids = {entry[0] for entry in roster.values() if entry[0]}
+    next_id = 1
+    for entry in roster.values():
+        if not entry[0]:
+            while str(next_id) in used_ids:
+                next_id += 1
+            entry[0] = str(next_id)
+            next_id += 1
+
+    report = [(roster[key][0], roster[key][1], places, "重复") for key, places in duplicates.items()]
+    for keys in conflicts:
+        names = " / ".join(roster[key][1] for key in keys)
+        report.append((roster[keys[0]][0], names, [place for key in keys for place in positions(key)], "ID冲突"))
+    report += [(roster[key][0], roster[key][1], places, "无ID同名") for key, places in suspects.items()]
+    with open(output_file, "w", encoding="utf-8") as file:
+        file.writelines(f"{entry[0]}\t{entry[1]}\n" for entry in roster.values())
+    with open(report_file, "w", encoding="utf-8") as file:
+        for person_id, name, places, kind in report:
+            file.write(f"{person_id}\t{name}\t{len(places)}\t{', '.join(places)}\t{kind}\n")
+    return len(roster), len(duplicates), len(conflicts), len(suspects)
 
 
 def draw_lottery(names, num_winners):
     return random.sample(names, num_winners)
 
 
+class LotterySession:
+    """多轮抽奖会话: 名单只读取一次, 已中奖者记入排除集合并写入日志, 崩溃后可从日志恢复"""
+
+    def __init__(self, names, journal_path="lottery_journal.txt"):
+        self.journal_path = journal_path
+        self.pool = list(dict.fromkeys(name for name in names if name))  # 剩余名单(去重)
+        self.merged = sum(1 for name in names if name) - len(self.pool)  # 同名合并的条目数, 同名的人只能中奖一次
+        self.positions = {name: index for index, name in enumerate(self.pool)}  # 名字 -> 在剩余名单中的下标
+        self.winners = set()  # 已中奖者(排除集合)
+        self.round = 0  # 已抽轮数
+        self._load_journal()
+
+    def _load_journal(self):
+        """
+        从日志恢复已中奖者, 每行一个名字, 空行为轮次分隔
+        写日志中途崩溃时, 末尾不完整的行会被截掉, 缺少分隔的一轮会补上空行, 避免下一轮的名字接在后面
+        已写入的完整名字仍算中奖, 不在名单中的名字忽略
+        """
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "r+b") as file:
+            data = file.read()
+            end = data.rfind(b"\n") + 1
+            complete = data[:end]
+            needs_separator = complete.rstrip(b"\n") and not complete.endswith(b"\n\n")
+            if end < len(data) or needs_separator:
+                file.truncate(end)
+                file.seek(end)
+                if needs_separator:
+                    file.write(b"\n")
+                    complete += b"\n"
+                file.flush()
+                os.fsync(file.fileno())
+        for name in complete.decode("utf-8").split("\n")[:-1]:
+            if not name:
+                self.round += 1
+            elif name in self.positions:
+                self.winners.add(name)
+                self._remove(name)
+
+    def _remove(self, name):
+        """从剩余名单中移除, 与末尾元素交换后弹出, O(1)"""
+        index = self.positions.pop(name, None)
+        if index is None:
+            return
+        last = self.pool.pop()
+        if index < len(self.pool):
+            self.pool[index] = last
+            self.positions[last] = index
+
+    def remaining(self):
+        return len(self.pool)
+
+    def draw(self, num_winners):
+        """从剩余名单中抽取一轮, 耗时只与本轮中奖人数相关, 写日志失败时抛出OSError, 名单不变"""
+        if num_winners <= 0:
+            raise ValueError("中奖人数必须大于0")
+        if num_winners > len(self.pool):
+            raise ValueError(f"剩余人数为 {len(self.pool)}, 不足以抽取 {num_winners} 人")
+        round_winners = random.sample(self.pool, num_winners)
+        # 先写日志再从名单中移除, 写入失败时名单不变, 中途崩溃也不会重复中奖
+        with open(self.journal_path, "a", encoding="utf-8") as file:
+            file.write("".join(f"{name}\n" for name in round_winners) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        for name in round_winners:
+            self._remove(name)
+            self.winners.add(name)
+        self.round += 1
+        return round_winners
+
+
+def session_main():
+    names = read_names()
+    session = LotterySession(names)
+    if session.merged:
+        print(f"注意: 名单中有 {session.merged} 个重复的名字已合并, 可先用 --prepare 整理名单")
+    if session.round:
+        print(f"已从日志恢复 {session.round} 轮, 已中奖 {len(session.winners)} 人")
+    while True:
+        print(f"剩余人数: {session.remaining()}")
+        count = input(f"请输入第 {session.round + 1} 轮的中奖人数(直接回车结束): ").strip()
+        if not count:
+            break
+        if not count.isdigit():
+            print("请输入有效的数字")
+            continue
+        try:
+            round_winners = session.draw(int(count))
+        except ValueError as e:
+            print(e)
+            continue
+        except OSError as e:
+            print(f"写入抽奖日志失败, 本轮未抽取: {e}")
+            continue
+        print("===============")
+        print(f"第 {session.round} 轮中奖名单:")
+        for winner in round_winners:
+            print(winner)
+        print("===============")
+
+
 def main():
     # 输入奖项数量
     first_prize_count = int(input("请输入一等奖的数量: "))
@@ -31,9 +236,11 @@ def main():
 
     # 抽奖
     first_prize_winners = draw_lottery(names, first_prize_count)
-    remaining_names = [name for name in names if name not in first_prize_winners]
+    excluded = set(first_prize_winners)
+    remaining_names = [name for name in names if name not in excluded]
     second_prize_winners = draw_lottery(remaining_names, second_prize_count)
-    remaining_names = [name for name in remaining_names if name not in second_prize_winners]
+    excluded = set(second_prize_winners)
+    remaining_names = [name for name in remaining_names if name not in excluded]
     third_prize_winners = draw_lottery(remaining_names, third_prize_count)
 
     # 打印中奖名单
@@ -52,5 +259,33 @@ def main():
     print("===============")
 
 
+def profile_startup():
+    """统计启动各阶段耗时, 输出后退出"""
+    imported = time.perf_counter()
+    names = read_names()
+    loaded = time.perf_counter()
+    print("启动耗时(毫秒):")
+    print(f"  导入模块: {(imported - startup_time) * 1000:.1f}")
+    print(f"  读取名单: {(loaded - imported) * 1000:.1f} ({len(names)} 人)")
+    print(f"  合计: {(loaded - startup_time) * 1000:.1f}")
+
+
 if __name__ == "__main__":
-    main()
+    # python Lottery.py --session  多轮抽奖模式
+    # python Lottery.py --profile-startup  统计启动耗时
+    # python Lottery.py --prepare a.txt b.txt  合并整理名单, 写入 lottery.txt 和 lottery_duplicates.txt
+    if "--profile-startup" in sys.argv[1:]:
+        profile_startup()
+    elif sys.argv[1:2] == ["--prepare"]:
+        if len(sys.argv) < 3:
+            print("请指定名单文件")
+        else:
+            total, duplicate_count, conflict_count, suspect_count = prepare_roster(sys.argv[2:])
+            print(
+                f"整理后名单人数: {total}, 重复: {duplicate_count}, "
+                f"ID冲突(需确认): {conflict_count}, 无ID同名(需确认): {suspect_count}"
+            )
+    elif "--session" in sys.argv[1:]:
+        session_main()
+    else:
+        main()
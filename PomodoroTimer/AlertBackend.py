@@ -0,0 +1,137 @@
+"""
+计时结束声音提醒
+
+- 声音文件只在启动时读取和解码一次, 之后从内存播放
+- 在后台线程播放, 不阻塞Tk主循环
+- Windows使用winsound, Linux使用aplay/pacat, 测试或无声音设备时使用NullAlertBackend
+"""
+
+import abc
+import contextlib
+import os
+import queue
+import sys
+import threading
+
+
+def resource_path(file_name):
+    """资源文件路径, 打包的exe优先使用打包目录下的文件"""
+    if getattr(sys, "frozen", False):
+        path = os.path.join(sys._MEIPASS, file_name)
+        if os.path.exists(path):
+            return path
+    return file_name
+
+
+class AlertBackend(abc.ABC):
+    """提醒后端接口"""
+
+    @abc.abstractmethod
+    def play(self):
+        """播放一次提醒, 不阻塞调用方"""
+
+    def close(self):  # noqa: B027 默认不需要释放资源, 不要求子类实现
+        pass
+
+
+class NullAlertBackend(AlertBackend):
+    """不播放声音, 只记录播放次数"""
+
+    def __init__(self):
+        self.play_count = 0
+
+    def play(self):
+        self.play_count += 1
+
+
+class ThreadedAlertBackend(AlertBackend):
+    """后台线程播放, 播放中再次触发的提醒会合并"""
+
+    def __init__(self):
+        self._requests = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._worker, name="alert", daemon=True)
+        self._thread.start()
+
+    def play(self):
+        with contextlib.suppress(queue.Full):  # 已有待播放的提醒
+            self._requests.put_nowait(True)
+
+    def close(self):
+        with contextlib.suppress(queue.Full):
+            self._requests.put_nowait(False)
+
+    def _worker(self):
+        while self._requests.get():
+            with contextlib.suppress(OSError):  # 声音设备不可用时忽略
+                self._play_buffer()
+
+    @abc.abstractmethod
+    def _play_buffer(self):
+        """在后台线程中同步播放一次"""
+
+
+class WinsoundAlertBackend(ThreadedAlertBackend):
+    def __init__(self, data):
+        import winsound  # Windows播放声音  # noqa: PLC0415
+
+        self._winsound = winsound
+        self.data = data  # wav文件内容, 为None时播放系统提示音
+        super().__init__()
+
+    def _play_buffer(self):
+        if self.data is None:
+            self._winsound.MessageBeep()
+        else:
+            # SND_MEMORY不支持SND_ASYNC, 在后台线程中同步播放
+            self._winsound.PlaySound(self.data, self._winsound.SND_MEMORY)
+
+
+class LinuxAlertBackend(ThreadedAlertBackend):
+    # wav采样宽度 -> (aplay格式, pacat格式)
+    SAMPLE_FORMATS = {1: ("U8", "u8"), 2: ("S16_LE", "s16le"), 4: ("S32_LE", "s32le")}
+
+    def __init__(self, data):
+        import io  # noqa: PLC0415
+        import shutil  # noqa: PLC0415
+        import wave  # noqa: PLC0415
+
+        try:
+            with wave.open(io.BytesIO(data)) as wav:
+                channels = wav.getnchannels()
+                rate = wav.getframerate()
+                aplay_format, pacat_format = self.SAMPLE_FORMATS[wav.getsampwidth()]
+                self.frames = wav.readframes(wav.getnframes())  # 解码后的PCM数据
+        except (EOFError, KeyError, wave.Error) as e:
+            raise OSError(f"不支持的声音文件: {e}") from e
+        if shutil.which("aplay"):
+            self.command = ["aplay", "-q", "-t", "raw", "-f", aplay_format, "-c", str(channels), "-r", str(rate)]
+        elif shutil.which("pacat"):
+            self.command = ["pacat", f"--format={pacat_format}", f"--channels={channels}", f"--rate={rate}"]
+        else:
+            raise OSError("未找到aplay或pacat")
+        super().__init__()
+
+    def _play_buffer(self):
+        import subprocess  # noqa: PLC0415
+
+        # 播放失败(如设备被占用)时下次提醒再试, 不检查返回码
+        subprocess.run(
+            self.command, input=self.frames, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False
+        )
+
+
+def create_alert_backend(sound_file):
+    """根据平台创建提醒后端, 无法播放时返回NullAlertBackend"""
+    try:
+        with open(resource_path(sound_file), "rb") as f:
+            data = f.read()
+    except OSError:
+        data = None
+    if sys.platform == "win32":
+        return WinsoundAlertBackend(data)
+    if sys.platform.startswith("linux") and data is not None:
+        try:
+            return LinuxAlertBackend(data)
+        except OSError:
+            pass
+    return NullAlertBackend()
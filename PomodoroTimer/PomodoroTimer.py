@@ -1,13 +1,20 @@
-import ctypes  # C语言扩展
+# ruff: noqa: E402
+import time  # 处理时间
+
+startup_time = time.perf_counter()  # 启动时间, --profile-startup 统计导入耗时
+
+import contextlib  # 忽略可以不处理的异常
 import os  # 系统交互
 import re  # 正则表达式
+import sqlite3  # 历史记录数据库
 import sys  # 系统属性
-import time  # 处理时间
 import tkinter as tk  # 显示界面
-import winsound  # Windows播放声音
-from tkinter import messagebox  # 显示消息框
 
-from win32api import GetMonitorInfo, MonitorFromPoint  # 屏幕信息获取
+from AlertBackend import AlertBackend, create_alert_backend  # 声音提醒
+from SessionHistory import SessionHistory  # 历史记录
+from TimerEngine import REST_STATE, WORK_STATE, TimerEngine  # 计时引擎
+from TimerScheduler import TimerScheduler  # 计时调度
+from WindowPlacement import WindowPlacement  # 窗口位置和拖动
 
 # cd ./PomodoroTimer
 # pyinstaller -n PomodoroTimer --add-data "timer.ico;." --add-data "ring.wav;." -i timer.ico -F -w .\PomodoroTimer.py
@@ -22,22 +29,33 @@ init_geometry = "320x140"
 running_geometry = "138x138"
 
 input_regex = r"^(([0]|[1-9]\d{0,2})((\.\d{0,2})?))?$"
+reminder_interval = 5 * 60  # 提示框未关闭时再次提醒的间隔(秒)
+schedule_file = os.path.join(os.path.expanduser("~"), ".pomodoro_schedule.json")  # 退出时保存的计时
 
 
 class PomodoroTimer:
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, alert: AlertBackend | None = None):
+        """
+        :param root: 源窗口
+        :param alert: 声音提醒后端, 默认根据平台创建, 测试时可传入NullAlertBackend
+        """
         self.root = root  # 源窗口
+        self.placement = WindowPlacement(root)  # 窗口位置和拖动
         self._config_root_window()  # 配置源窗口参数
         self._create_widgets()  # 配置GUI组件
 
-        self.clock_state = 1  # 番茄时钟状态(1:工作状态;2:休息状态)
-        self.is_running = False  # 是否计时中
-        self.remaining_time = 0  # 计时剩余时间(秒)
-        self.end_time = 0  # 计时结束时间
-
-        self.dragging = False
-        self.drag_start_x = 0
-        self.drag_start_y = 0
+        self.alert = alert if alert is not None else create_alert_backend("ring.wav")  # 声音提醒, 启动时加载一次
+        self.history = SessionHistory()  # 历史记录
+        # 计时引擎和弹窗提醒共用一个调度器, 同一时间只有一次root.after唤醒
+        self.scheduler = TimerScheduler(self.root.after, self.root.after_cancel)
+        self.scheduler.register(
+            "reminder", lambda name, path: self._popup_schedule_reminder(self.root.nametowidget(path))
+        )
+        self.engine = TimerEngine(self.scheduler.after, self.scheduler.after_cancel)  # 计时引擎
+        self.engine.subscribe(self._record_session)  # 先记录, 结束弹窗会阻塞后续事件处理
+        self.engine.subscribe(self._on_timer_event)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._restore_countdown()  # 恢复上次退出时的计时
 
     @staticmethod
     def _update_time_label(time_var, label):
@@ -54,39 +72,68 @@ class PomodoroTimer:
         except ValueError:
             pass
 
-    def _update_timer(self):
-        """更新计时器显示"""
-        if self.is_running:
-            self.remaining_time = max(0, int(self.end_time - time.time()))
-            if self.remaining_time > 0:
-                minutes, seconds = divmod(self.remaining_time, 60)
-                if self.clock_state == 1:
-                    self.work_time_label.config(text=f"{minutes:02d}:{seconds:02d}")
-                elif self.clock_state == 2:
-                    self.rest_time_label.config(text=f"{minutes:02d}:{seconds:02d}")
-                self.root.after(200, self._update_timer)
-            else:
-                if self.clock_state == 1:
-                    self.work_time_label.config(text="00:00")
-                elif self.clock_state == 2:
-                    self.rest_time_label.config(text="00:00")
-                self._timer_finished()
+    def _on_timer_event(self, event, engine):
+        """计时引擎事件处理"""
+        if event == "tick":
+            # 只在显示的秒数变化时更新标签
+            minutes, seconds = divmod(engine.displayed, 60)
+            label = self.work_time_label if engine.state == WORK_STATE else self.rest_time_label
+            label.config(text=f"{minutes:02d}:{seconds:02d}")
+        elif event == "finished":
+            self._timer_finished()
+
+    def _record_session(self, event, engine):
+        """记录完成, 暂停, 重置的计时"""
+        outcomes = {"finished": "completed", "paused": "paused", "reset": "reset"}
+        if event not in outcomes or engine.ended_state is None:
+            return
+        kind = "work" if engine.ended_state == WORK_STATE else "rest"
+        with contextlib.suppress(sqlite3.Error):  # 记录失败不影响计时
+            self.history.record(kind, outcomes[event], engine.elapsed)
+
+    def show_stats(self):
+        """统计弹窗"""
+        top = tk.Toplevel(self.root, bg=bg_color)
+        top.title("统计")
+        top.resizable(False, False)
+        lines = []
+        for name, (focus_seconds, pomodoros, interruptions) in (
+            ("今日", self.history.query_day()),
+            ("本周", self.history.query_week()),
+        ):
+            lines.append(f"{name}: 专注 {focus_seconds // 60} 分钟, 番茄 {pomodoros} 个, 中断 {interruptions} 次")
+        lines.append("")
+        for day, focus_seconds, pomodoros, interruptions in self.history.recent_days():
+            lines.append(f"{day}: {focus_seconds // 60} 分钟, {pomodoros} 个, 中断 {interruptions} 次")
+        label = tk.Label(top, text="\n".join(lines), justify=tk.LEFT, font=(font, 10), bg=bg_color, fg=fg_color)
+        label.pack(padx=10, pady=(10, 0))
+        export_button = tk.Button(
+            top, text="导出到CSV", command=self._export_stats, font=(font, 10), bg=bg_color, fg=fg_color
+        )
+        export_button.pack(pady=10)
+        self._set_dark_title_bar(top)
+        self.placement.center(top)
+
+    def _export_stats(self):
+        """按天导出统计到桌面"""
+        from tkinter import messagebox  # 显示消息框, 用到时再导入  # noqa: PLC0415
+
+        path = os.path.join(
+            os.path.expanduser("~/Desktop"),
+            "pomodoro-{}.csv".format(time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())),
+        )
+        try:
+            self.history.export_csv(path)
+            messagebox.showinfo("导出成功", f"文件已保存到：{path}")
+        except (OSError, sqlite3.Error) as e:
+            messagebox.showerror("错误", f"导出失败：{str(e)}")
 
     def _timer_finished(self):
         """计时器结束逻辑"""
-        msg = ""
-        if self.clock_state == 1:
-            msg = "工作计时结束"
-            self.clock_state = 2
-            self.remaining_time = int(float(self.rest_time.get()) * 60)
-        elif self.clock_state == 2:
-            msg = "休息计时结束"
-            self.clock_state = 1
-            self.remaining_time = 0
+        msg = "工作计时结束" if self.engine.ended_state == WORK_STATE else "休息计时结束"
         self._popup_message("提示", msg)
 
-        if self.clock_state == 1:
-            self.is_running = False
+        if self.engine.state == WORK_STATE:
             self.reset_button.pack_forget()
             self.start_button.pack(side=tk.LEFT, padx=10)
             self.work_entry.config(state=tk.NORMAL)
@@ -95,14 +142,12 @@ class PomodoroTimer:
             self._update_time_label(self.rest_time, self.rest_time_label)
             self._work_state_display_adjust(0)
             self._remove_drag()  # 移除拖动功能
-            self._center_window(self.root)  # 窗口居中
-        elif self.clock_state == 2:
+            self.placement.center(self.root)  # 窗口居中
+        elif self.engine.state == REST_STATE:
             self.start_button.pack_forget()
             self.pause_button.pack_forget()
             self.reset_button.pack(side=tk.LEFT, padx=10)
-            self.end_time = time.time() + self.remaining_time
-            self.is_running = True
-            self._update_timer()
+            self.engine.start(max(1, int(float(self.rest_time.get()) * 60)))
             self.root.overrideredirect(False)
             self._work_state_display_adjust(2)
             self.root.overrideredirect(True)
@@ -121,46 +166,35 @@ class PomodoroTimer:
         ok_button.pack(pady=10)
         top.grab_set()  # 设置模态窗口, 弹窗弹出时, 禁止对主窗口进行其他操作
         self._set_dark_title_bar(top)  # 设置弹窗黑色标题栏
-        self._popup_schedule_reminder(top)  # 弹窗定时提醒
+        self._popup_schedule_reminder(top)  # 弹窗提醒
+        # 不按确认, 隔一段时间再提醒
+        reminder = f"reminder{top}"
+        self.scheduler.add(reminder, reminder_interval, "reminder", str(top), repeat=reminder_interval, persist=False)
         self.root.wait_window(top)  # 等待弹窗关闭后再继续执行
+        self.scheduler.cancel(reminder)
 
     def _popup_schedule_reminder(self, window):
         """弹窗更新提醒"""
         # 音乐提醒
-        self._play_sound("ring.wav")
+        self.alert.play()
         # 弹窗显示到所有应用的最前面
         window.attributes("-topmost", 1)  # 窗口置顶
-        self._center_window(window)  # 居中显示再取消置顶, 不然居中位置不准确
+        self.placement.center(window)  # 居中显示再取消置顶, 不然居中位置不准确
         window.after_idle(window.attributes, "-topmost", 0)  # 取消置顶
-        # 不按确认, 隔一段时间再提醒
-        window.after(5 * 60 * 1000, lambda: self._popup_schedule_reminder(window))
-
-    @staticmethod
-    def _play_sound(sound_file):
-        """播放声音文件"""
-        if not getattr(sys, "frozen", False):
-            # 如果不是打包的exe, 直接播放同目录下的文件
-            winsound.PlaySound(sound_file, winsound.SND_ASYNC)
-            return
-        # 如果是打包的exe, 播放打包目录下的文件
-        sound_path = os.path.join(sys._MEIPASS, sound_file)
-        if os.path.exists(sound_path):
-            winsound.PlaySound(sound_path, winsound.SND_ASYNC)
-        else:
-            # exe中不存在文件，尝试播放同目录下的文件
-            winsound.PlaySound(sound_file, winsound.SND_ASYNC)
 
     def start_timer(self):
         try:
-            if self.remaining_time == 0:
-                if self.clock_state == 1:
-                    self.remaining_time = max(1, int(float(self.work_time.get()) * 60))
+            duration = self.engine.remaining
+            if duration == 0:
+                if self.engine.state == WORK_STATE:
+                    duration = max(1, int(float(self.work_time.get()) * 60))
                     self._work_state_display_adjust(1)
-                elif self.clock_state == 2:
-                    self.remaining_time = max(1, int(float(self.rest_time.get()) * 60))
+                elif self.engine.state == REST_STATE:
+                    duration = max(1, int(float(self.rest_time.get()) * 60))
                     self._work_state_display_adjust(2)
-            self.end_time = time.time() + self.remaining_time
         except ValueError:
+            from tkinter import messagebox  # 显示消息框, 用到时再导入  # noqa: PLC0415
+
             messagebox.showerror("错误", "请输入有效的数字")
             return
         self._setup_drag()  # 设置拖动功能
@@ -171,24 +205,71 @@ class PomodoroTimer:
         self.pause_button.pack(side=tk.LEFT, padx=10)
         self.reset_button.pack(side=tk.LEFT, padx=10)
         self.pause_button.config(state=tk.NORMAL)
-        self.is_running = True
-        self._update_timer()
+        self.engine.start(duration)
 
     def pause_timer(self):
         """暂停计时器"""
-        self.is_running = False
-        self.remaining_time = max(0, int(self.end_time - time.time()))
+        self.engine.pause()
+        self._show_paused_buttons()
+
+    def _show_paused_buttons(self):
         self.pause_button.pack_forget()
         self.reset_button.pack_forget()
         self.start_button.pack(side=tk.LEFT, padx=10)
         self.reset_button.pack(side=tk.LEFT, padx=10)
         self.start_button.config(state=tk.NORMAL)
 
+    def _on_close(self):
+        """退出时保存计时, 下次启动恢复"""
+        self.scheduler.cancel("pomodoro")
+        if self.engine.is_running:
+            # 计时继续进行, 工作计时在关闭期间结束时, 下次启动从休息计时继续
+            steps = []
+            if self.engine.state == WORK_STATE:
+                with contextlib.suppress(ValueError):
+                    steps.append(("countdown", max(1, int(float(self.rest_time.get()) * 60)), {"state": REST_STATE}))
+            self.scheduler.add("pomodoro", self.engine.time_left(), "countdown", {"state": self.engine.state}, steps)
+        elif self.engine.remaining > 0:
+            payload = {"state": self.engine.state, "paused": True, "remaining": self.engine.remaining}
+            self.scheduler.add("pomodoro", 0, "countdown", payload)
+        with contextlib.suppress(OSError):
+            self.scheduler.save(schedule_file)
+        self.alert.close()
+        self.root.destroy()
+
+    def _restore_countdown(self):
+        """恢复上次退出时保存的计时"""
+        try:
+            self.scheduler.load(schedule_file)
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        entry = self.scheduler.get("pomodoro")
+        if entry is not None and not entry.payload.get("paused"):
+            self.scheduler.run_due()  # 跳过关闭期间已结束的步骤
+            entry = self.scheduler.get("pomodoro")
+        if entry is None:
+            return
+        paused = entry.payload.get("paused", False)
+        remaining = entry.payload["remaining"] if paused else self.scheduler.remaining("pomodoro")
+        self.scheduler.cancel("pomodoro")
+        if remaining <= 0:
+            return
+        state = entry.payload["state"]
+        self.engine.restore(state, remaining)
+        self._work_state_display_adjust(state)
+        if paused:
+            self._setup_drag()
+            self.work_entry.config(state=tk.DISABLED)
+            self.rest_entry.config(state=tk.DISABLED)
+            self._show_paused_buttons()
+        else:
+            self.start_timer()
+            if state == REST_STATE:
+                self.pause_button.pack_forget()  # 与工作计时结束后自动开始的休息一致, 只显示重置按钮
+
     def reset_timer(self):
         """重置计时器"""
-        self.is_running = False
-        self.clock_state = 1
-        self.remaining_time = 0
+        self.engine.reset()
         self._update_time_label(self.work_time, self.work_time_label)
         self._update_time_label(self.rest_time, self.rest_time_label)
         self.work_entry.config(state=tk.NORMAL)
@@ -197,7 +278,7 @@ class PomodoroTimer:
         self.reset_button.pack_forget()
         self.start_button.pack(side=tk.LEFT, padx=10)
         self._work_state_display_adjust(0)
-        self._bottom_right_window(self.root)
+        self.placement.bottom_right(init_geometry)
         self._remove_drag()  # 移除拖动功能
 
     def _work_state_display_adjust(self, state):
@@ -210,8 +291,10 @@ class PomodoroTimer:
             self.work_time_label.pack(side=tk.LEFT, padx=(0, 20))
             self.rest_input_frame.pack(side=tk.LEFT, padx=(10, 0))
             self.rest_time_label.pack(side=tk.LEFT, padx=(20, 0))
+            self.stats_button.pack(side=tk.LEFT, padx=10)
             self.root.geometry(init_geometry)
         else:
+            self.stats_button.pack_forget()
             if state == 1:
                 self.rest_input_frame.pack_forget()
                 self.rest_time_label.pack_forget()
@@ -222,8 +305,7 @@ class PomodoroTimer:
                 self.work_time_label.pack_forget()
                 self.rest_input_frame.pack(side=tk.LEFT, padx=(0, 0))
                 self.rest_time_label.pack(side=tk.LEFT, padx=(0, 0))
-            self.root.geometry(running_geometry)
-            self._bottom_right_window(self.root)
+            self.placement.bottom_right(running_geometry)
 
     def _create_widgets(self) -> None:
         """创建并布局GUI组件"""
@@ -283,6 +365,18 @@ class PomodoroTimer:
             relief=tk.RIDGE,
         )
 
+        self.stats_button = tk.Button(
+            button_frame,
+            text="统计",
+            command=self.show_stats,
+            font=(font, font_size),
+            bg=bg_color,
+            fg=button2_color,
+            activebackground=button2_color,
+            activeforeground=fg_color,
+            relief=tk.RIDGE,
+        )
+
     def _create_timer_frame(self, main_frame) -> None:
         timer_frame = tk.Frame(main_frame, bg=bg_color)
         timer_frame.pack(pady=(0, 0))
@@ -351,7 +445,7 @@ class PomodoroTimer:
         self.root.resizable(False, False)  # 禁止窗口最大化
         self.root.geometry(init_geometry)  # 窗口大小
         self.root.attributes("-topmost", True)  # 窗口最前
-        self._center_window(self.root)  # 窗口居中
+        self.placement.center(self.root)  # 窗口居中
         self._set_dark_title_bar(self.root)  # 黑色标题栏
         self.root.bind("<FocusIn>", lambda x: self.root.attributes("-alpha", 1.0))  # 获取焦点时不透明
         self.root.bind("<FocusOut>", lambda x: self.root.attributes("-alpha", 0.3))  # 失去焦点时半透明
@@ -359,6 +453,10 @@ class PomodoroTimer:
     @staticmethod
     def _set_dark_title_bar(window) -> None:
         """设置黑色窗口标题栏"""
+        if sys.platform != "win32":
+            return
+        import ctypes  # C语言扩展, 只在Windows上用到  # noqa: PLC0415
+
         ctypes.windll.dwmapi.DwmSetWindowAttribute(
             ctypes.windll.user32.GetParent(window.winfo_id()),  # 窗口句柄
             20,  # 20表示MICA效果(Win11的一种背景效果)
@@ -366,68 +464,39 @@ class PomodoroTimer:
             ctypes.sizeof(ctypes.c_int(2)),  # 指针引用的大小
         )
 
-    def _center_window(self, window: tk.Tk) -> None:
-        window.update_idletasks()
-        width = window.winfo_width()
-        height = window.winfo_height()
-        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.root.winfo_screenheight() // 2) - (height // 2)
-        window.geometry(f"{width}x{height}+{x}+{y}")
-        window.deiconify()
-
-    def _bottom_right_window(self, window: tk.Tk) -> None:
-        window.update_idletasks()
-        monitor_info = GetMonitorInfo(MonitorFromPoint((0, 0)))
-        monitor_area = monitor_info.get("Monitor")
-        work_area = monitor_info.get("Work")
-        taskbar_height = monitor_area[3] - work_area[3]
-        title_bar_height = self.root.winfo_rooty() - self.root.winfo_y()
-        x = self.root.winfo_screenwidth() - window.winfo_width()
-        y = self.root.winfo_screenheight() - window.winfo_height() - title_bar_height - taskbar_height
-        window.geometry(f"+{x}+{y}")
-
     def _setup_drag(self):
         """设置拖动功能"""
         self.root.overrideredirect(True)  # 移除窗口边框
-        self.root.bind("<ButtonPress-1>", self._start_drag)
-        self.root.bind("<B1-Motion>", self._drag)
-        self.root.bind("<ButtonRelease-1>", lambda event: setattr(self, "dragging", False))
+        self.placement.enable_drag([self.start_button, self.pause_button, self.reset_button])
 
     def _remove_drag(self):
         """移除拖动功能"""
         self.root.overrideredirect(False)  # 恢复窗口边框
         self._set_dark_title_bar(self.root)  # 重新设置黑色标题栏
         self.root.attributes("-alpha", 1.0)  # 设置窗口不透明
-        self.root.unbind("<ButtonPress-1>")
-        self.root.unbind("<B1-Motion>")
-        self.root.unbind("<ButtonRelease-1>")
-
-    def _start_drag(self, event):
-        """开始拖动"""
-        if not self._is_on_button(event):
-            self.dragging = True
-            self.drag_start_x = event.x
-            self.drag_start_y = event.y
-
-    def _drag(self, event):
-        """拖动窗口"""
-        if self.dragging:
-            x = self.root.winfo_x() + (event.x - self.drag_start_x)
-            y = self.root.winfo_y() + (event.y - self.drag_start_y)
-            self.root.geometry(f"+{x}+{y}")
-
-    def _is_on_button(self, event):
-        """检查点击是否在按钮上"""
-        for widget in [self.start_button, self.pause_button, self.reset_button]:
-            if widget.winfo_ismapped():
-                x = self.root.winfo_x() + widget.winfo_x()
-                y = self.root.winfo_y() + widget.winfo_y()
-                if x <= event.x_root <= x + widget.winfo_width() and y <= event.y_root <= y + widget.winfo_height():
-                    return True
-        return False
+        self.placement.disable_drag()
+
+
+def profile_startup():
+    """统计启动各阶段耗时, 输出后退出"""
+    imported = time.perf_counter()
+    tk_root = tk.Tk()
+    PomodoroTimer(tk_root)
+    created = time.perf_counter()
+    tk_root.update()  # 处理绘制事件
+    painted = time.perf_counter()
+    tk_root.destroy()  # 不保存计时
+    print("启动耗时(毫秒):")
+    print(f"  导入模块: {(imported - startup_time) * 1000:.1f}")
+    print(f"  创建窗口: {(created - imported) * 1000:.1f}")
+    print(f"  首次绘制: {(painted - created) * 1000:.1f}")
+    print(f"  合计: {(painted - startup_time) * 1000:.1f}")
 
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv[1:]:
+        profile_startup()
+        sys.exit()
     tk_root = tk.Tk()  # 创建主窗口
     app = PomodoroTimer(tk_root)  # 创建应用实例
     tk_root.mainloop()  # 进入主事件循环
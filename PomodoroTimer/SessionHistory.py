@@ -0,0 +1,154 @@
+"""
+番茄时钟历史记录, 保存在SQLite数据库中
+
+- sessions: 每段计时一条记录, 只追加不修改
+- daily_stats / weekly_stats: 按天/按周的统计, 写入记录时在同一事务中增量更新, 统计和导出无需扫描全部历史
+
+sessions 字段
+| 字段       | 解释                                      |
+| ---------- | ----------------------------------------- |
+| kind       | 计时类型, work:工作, rest:休息            |
+| outcome    | 结束方式, completed:完成, paused:暂停, reset:重置 |
+| started_at | 开始时间(本地时间)                        |
+| ended_at   | 结束时间(本地时间)                        |
+| seconds    | 实际计时秒数                              |
+
+统计表字段
+| 字段          | 解释                     |
+| ------------- | ------------------------ |
+| focus_seconds | 工作计时总秒数           |
+| pomodoros     | 完成的番茄钟(工作)数量   |
+| interruptions | 工作计时暂停或重置的次数 |
+"""
+
+import os
+import sqlite3
+import time
+
+DEFAULT_DB_FILE = os.path.join(os.path.expanduser("~"), ".pomodoro_history.db")
+
+_UPSERT_STATS = """
+INSERT INTO {table} ({key}, focus_seconds, pomodoros, interruptions) VALUES (?, ?, ?, ?)
+ON CONFLICT({key}) DO UPDATE SET
+    focus_seconds = focus_seconds + excluded.focus_seconds,
+    pomodoros = pomodoros + excluded.pomodoros,
+    interruptions = interruptions + excluded.interruptions
+"""
+
+
+class SessionHistory:
+    def __init__(self, db_file=DEFAULT_DB_FILE):
+        self.db_file = db_file
+        self.conn = None
+        self.cursor = None
+        self.create_table()
+
+    def connect(self):
+        self.conn = sqlite3.connect(self.db_file)
+        self.cursor = self.conn.cursor()
+
+    def close(self):
+        if self.cursor:
+            self.cursor.close()
+        if self.conn:
+            self.conn.close()
+
+    def create_table(self):
+        self.connect()
+        self.cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS "sessions" (
+            "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+            "kind" VARCHAR(8) NOT NULL,
+            "outcome" VARCHAR(16) NOT NULL,
+            "started_at" VARCHAR(19) NOT NULL,
+            "ended_at" VARCHAR(19) NOT NULL,
+            "seconds" INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS "daily_stats" (
+            "day" VARCHAR(10) PRIMARY KEY NOT NULL,
+            "focus_seconds" INTEGER NOT NULL DEFAULT 0,
+            "pomodoros" INTEGER NOT NULL DEFAULT 0,
+            "interruptions" INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS "weekly_stats" (
+            "week" VARCHAR(8) PRIMARY KEY NOT NULL,
+            "focus_seconds" INTEGER NOT NULL DEFAULT 0,
+            "pomodoros" INTEGER NOT NULL DEFAULT 0,
+            "interruptions" INTEGER NOT NULL DEFAULT 0
+        );
+        """)
+        self.conn.commit()
+        self.close()
+
+    def record(self, kind, outcome, seconds, ended_at=None):
+        """追加一段计时记录, 并增量更新所在天和所在周的统计"""
+        ended_at = time.time() if ended_at is None else ended_at
+        seconds = max(0, int(round(seconds)))
+        ended = time.localtime(ended_at)
+        started = time.localtime(ended_at - seconds)
+        focus_seconds = seconds if kind == "work" else 0
+        pomodoros = 1 if kind == "work" and outcome == "completed" else 0
+        interruptions = 1 if kind == "work" and outcome in ("paused", "reset") else 0  # 休息被打断不算中断
+
+        self.connect()
+        with self.conn:  # 同一事务, 记录和统计保持一致
+            self.cursor.execute(
+                "INSERT INTO sessions (kind, outcome, started_at, ended_at, seconds) VALUES (?, ?, ?, ?, ?)",
+                (
+                    kind,
+                    outcome,
+                    time.strftime("%Y-%m-%d %H:%M:%S", started),
+                    time.strftime("%Y-%m-%d %H:%M:%S", ended),
+                    seconds,
+                ),
+            )
+            stats = (focus_seconds, pomodoros, interruptions)
+            self.cursor.execute(
+                _UPSERT_STATS.format(table="daily_stats", key="day"), (time.strftime("%Y-%m-%d", ended), *stats)
+            )
+            self.cursor.execute(
+                _UPSERT_STATS.format(table="weekly_stats", key="week"), (time.strftime("%G-W%V", ended), *stats)
+            )
+        self.close()
+
+    def query_day(self, day=None):
+        """查询某天统计, 默认今天, 返回(专注秒数, 番茄数, 中断次数)"""
+        day = day or time.strftime("%Y-%m-%d")
+        return self._query_stats("SELECT focus_seconds, pomodoros, interruptions FROM daily_stats WHERE day = ?", day)
+
+    def query_week(self, week=None):
+        """查询某周统计, 默认本周, 返回(专注秒数, 番茄数, 中断次数)"""
+        week = week or time.strftime("%G-W%V")
+        return self._query_stats(
+            "SELECT focus_seconds, pomodoros, interruptions FROM weekly_stats WHERE week = ?", week
+        )
+
+    def _query_stats(self, sql, key):
+        self.connect()
+        self.cursor.execute(sql, (key,))
+        result = self.cursor.fetchone()
+        self.close()
+        return result or (0, 0, 0)
+
+    def recent_days(self, limit=7):
+        """最近有记录的几天统计, 按日期倒序"""
+        self.connect()
+        self.cursor.execute(
+            "SELECT day, focus_seconds, pomodoros, interruptions FROM daily_stats ORDER BY day DESC LIMIT ?", (limit,)
+        )
+        result = self.cursor.fetchall()
+        self.close()
+        return result
+
+    def export_csv(self, path):
+        """按天导出统计"""
+        import csv  # noqa: PLC0415
+
+        self.connect()
+        self.cursor.execute("SELECT day, focus_seconds, pomodoros, interruptions FROM daily_stats ORDER BY day")
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(["日期", "专注分钟", "完成番茄数", "中断次数"])
+            for day, focus_seconds, pomodoros, interruptions in self.cursor:
+                writer.writerow([day, round(focus_seconds / 60, 1), pomodoros, interruptions])
+        self.close()
@@ -0,0 +1,143 @@
+"""
+番茄时钟计时引擎, 与界面无关
+
+- 使用单调时钟计时, 不受系统时间调整影响
+- 只在显示的秒数变化时唤醒一次, 不再固定间隔轮询
+- 通过事件通知界面, 界面只需订阅事件
+- 时钟和定时函数可注入, 测试时可以使用假时钟, 无需图形界面
+
+事件列表(listener(event, engine)):
+| 事件     | 说明                                     |
+| -------- | ---------------------------------------- |
+| started  | 开始或继续计时                           |
+| tick     | 显示的剩余秒数变化                       |
+| paused   | 暂停计时                                 |
+| finished | 计时结束, 此时 state 已切换到下一个状态  |
+| reset    | 重置计时                                 |
+"""
+
+import math
+import time
+
+WORK_STATE = 1  # 工作状态
+REST_STATE = 2  # 休息状态
+
+
+class TimerEngine:
+    def __init__(self, schedule, cancel, clock=time.monotonic):
+        """
+        :param schedule: 定时函数, schedule(毫秒, 回调) 返回定时句柄, 如 root.after
+        :param cancel: 取消定时函数, cancel(句柄), 如 root.after_cancel
+        :param clock: 单调时钟, 返回秒
+        """
+        self._schedule = schedule
+        self._cancel = cancel
+        self._clock = clock
+        self._listeners = []
+        self._wakeup = None  # 当前定时句柄
+        self._end_time = 0.0  # 计时结束时间(单调时钟)
+        self._segment_start = 0.0  # 本段计时开始时间(单调时钟)
+
+        self.state = WORK_STATE  # 番茄时钟状态(1:工作状态;2:休息状态)
+        self.is_running = False  # 是否计时中
+        self.remaining = 0.0  # 计时剩余时间(秒), 为0表示未开始
+        self.displayed = 0  # 当前显示的剩余秒数
+        self.ended_state = None  # 最近一段结束(暂停/结束/重置)的计时所属状态, 重置时未在计时(包括已暂停)则为None
+        self.elapsed = 0.0  # 最近一段计时实际经过的秒数
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def _emit(self, event):
+        for listener in list(self._listeners):
+            listener(event, self)
+
+    def time_left(self):
+        """当前剩余秒数"""
+        if self.is_running:
+            return max(0.0, self._end_time - self._clock())
+        return self.remaining
+
+    def restore(self, state, remaining):
+        """恢复到暂停状态, 之后调用start继续计时"""
+        self._cancel_wakeup()
+        self.is_running = False
+        self.state = state
+        self.remaining = float(remaining)
+        self.displayed = math.ceil(self.remaining)
+        self._emit("tick")
+
+    def start(self, duration):
+        """开始或继续计时, 未开始时使用duration(秒)作为计时时长"""
+        if self.is_running:
+            return
+        if self.remaining <= 0:
+            self.remaining = float(duration)
+        now = self._clock()
+        self._segment_start = now
+        self._end_time = now + self.remaining
+        self.is_running = True
+        self.displayed = math.ceil(self.remaining)
+        self._emit("started")
+        self._emit("tick")
+        self._schedule_wakeup(now)
+
+    def pause(self):
+        """暂停计时"""
+        if not self.is_running:
+            return
+        now = self._clock()
+        self._cancel_wakeup()
+        self.is_running = False
+        self.remaining = max(0.0, self._end_time - now)
+        self.elapsed = now - self._segment_start
+        self.ended_state = self.state
+        self._emit("paused")
+
+    def reset(self):
+        """重置计时, 回到工作状态"""
+        self._cancel_wakeup()
+        self.elapsed = self._clock() - self._segment_start if self.is_running else 0.0
+        self.ended_state = self.state if self.is_running else None  # 暂停后重置不再记一次中断
+        self.is_running = False
+        self.state = WORK_STATE
+        self.remaining = 0.0
+        self.displayed = 0
+        self._emit("reset")
+
+    def _schedule_wakeup(self, now):
+        """计算显示秒数下一次变化的时间, 只定时一次"""
+        remaining = self._end_time - now
+        delay = remaining - (self.displayed - 1)
+        self._wakeup = self._schedule(max(1, math.ceil(delay * 1000)), self._on_wakeup)
+
+    def _cancel_wakeup(self):
+        if self._wakeup is not None:
+            self._cancel(self._wakeup)
+            self._wakeup = None
+
+    def _on_wakeup(self):
+        self._wakeup = None
+        if not self.is_running:
+            return
+        now = self._clock()
+        self.remaining = max(0.0, self._end_time - now)
+        if self.remaining <= 0:
+            self._finish(now)
+            return
+        displayed = math.ceil(self.remaining)
+        if displayed != self.displayed:
+            self.displayed = displayed
+            self._emit("tick")
+        self._schedule_wakeup(now)
+
+    def _finish(self, now):
+        """计时结束, 切换到下一个状态"""
+        self.is_running = False
+        self.elapsed = now - self._segment_start
+        self.displayed = 0
+        self._emit("tick")
+        self.ended_state = self.state
+        self.state = REST_STATE if self.state == WORK_STATE else WORK_STATE
+        self.remaining = 0.0
+        self._emit("finished")
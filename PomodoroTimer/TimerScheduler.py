@@ -0,0 +1,180 @@
+"""
+计时调度器, 所有定时任务共用一个优先队列(按到期时间排序的堆)和一次唤醒
+
+- after / after_cancel: 与Tk的root.after用法一致的临时定时, 供计时引擎和弹窗提醒使用
+- add: 命名定时器, 可附带后续步骤(如 4x25/5 后接 15 分钟长休息), 也可设置重复间隔
+- 任意数量的定时器只占用一次唤醒, 取消时只做标记, 出堆时跳过
+- save / load: 保存命名定时器的剩余时间, 重启后恢复, 关闭期间经过的时间会扣除
+- 重复定时器错过多个间隔时只补触发一次
+
+步骤格式: (类型, 秒数, 附加数据), 到期时调用 register 注册的 handler(名称, 附加数据)
+"""
+
+import heapq
+import itertools
+import json
+import time
+
+
+class ScheduledEntry:
+    __slots__ = ("deadline", "name", "kind", "payload", "steps", "repeat", "callback", "persist", "cancelled")
+
+    def __init__(
+        self, deadline, name=None, kind=None, payload=None, steps=(), repeat=None, callback=None, persist=False
+    ):
+        self.deadline = deadline  # 到期时间(单调时钟)
+        self.name = name  # 名称, 临时定时为None
+        self.kind = kind  # 类型, 用于查找handler
+        self.payload = payload  # 附加数据, 需要能被json序列化
+        self.steps = list(steps)  # 后续步骤
+        self.repeat = repeat  # 重复间隔(秒)
+        self.callback = callback  # 临时定时的回调
+        self.persist = persist  # 是否保存
+        self.cancelled = False
+
+
+class TimerScheduler:
+    def __init__(self, schedule, cancel, clock=time.monotonic, wall_clock=time.time):
+        """
+        :param schedule: 定时函数, schedule(毫秒, 回调) 返回定时句柄, 如 root.after
+        :param cancel: 取消定时函数, cancel(句柄), 如 root.after_cancel
+        :param clock: 单调时钟, 返回秒
+        :param wall_clock: 系统时间, 用于保存和恢复
+        """
+        self._schedule = schedule
+        self._cancel = cancel
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._heap = []  # (到期时间, 序号, 定时任务)
+        self._counter = itertools.count()  # 到期时间相同时按加入顺序
+        self._named = {}  # 名称 -> 定时任务
+        self._handlers = {}  # 类型 -> handler
+        self._wakeup = None  # 当前唤醒句柄
+        self._wakeup_deadline = None  # 当前唤醒对应的到期时间
+
+    def register(self, kind, handler):
+        """注册定时器类型的处理函数, handler(名称, 附加数据)"""
+        self._handlers[kind] = handler
+
+    def after(self, ms, callback):
+        """临时定时, 返回的句柄用于after_cancel"""
+        entry = ScheduledEntry(self._clock() + ms / 1000, callback=callback)
+        self._push(entry)
+        return entry
+
+    def after_cancel(self, entry):
+        entry.cancelled = True
+
+    def add(self, name, seconds, kind, payload=None, steps=(), repeat=None, persist=True):
+        """添加命名定时器, 同名定时器会被替换"""
+        self.cancel(name)
+        entry = ScheduledEntry(self._clock() + seconds, name, kind, payload, steps, repeat, persist=persist)
+        self._named[name] = entry
+        self._push(entry)
+        return entry
+
+    def cancel(self, name):
+        entry = self._named.pop(name, None)
+        if entry is not None:
+            entry.cancelled = True
+
+    def get(self, name):
+        """命名定时器, 不存在时返回None"""
+        return self._named.get(name)
+
+    def remaining(self, name):
+        """命名定时器当前步骤的剩余秒数, 不存在时返回None"""
+        entry = self._named.get(name)
+        if entry is None:
+            return None
+        return max(0.0, entry.deadline - self._clock())
+
+    def _push(self, entry):
+        heapq.heappush(self._heap, (entry.deadline, next(self._counter), entry))
+        # 处理到期任务时也立即安排唤醒, 回调可能阻塞(如弹窗的wait_window), 不能等处理完再安排
+        self._rearm()
+
+    def _rearm(self):
+        """只为堆顶的到期时间保留一次唤醒"""
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        deadline = self._heap[0][0] if self._heap else None
+        if deadline == self._wakeup_deadline:
+            return
+        if self._wakeup is not None:
+            self._cancel(self._wakeup)
+            self._wakeup = None
+        self._wakeup_deadline = deadline
+        if deadline is not None:
+            delay = max(0.0, deadline - self._clock())
+            self._wakeup = self._schedule(max(1, int(delay * 1000 + 0.999)), self._on_wakeup)
+
+    def _on_wakeup(self):
+        self._wakeup = None
+        self._wakeup_deadline = None
+        self.run_due()
+
+    def run_due(self):
+        """立即处理所有已到期的定时任务"""
+        now = self._clock()
+        try:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, entry = heapq.heappop(self._heap)
+                if not entry.cancelled:
+                    self._fire(entry)
+        finally:
+            self._rearm()
+
+    def _fire(self, entry):
+        if entry.callback is not None:
+            entry.callback()
+            return
+        kind, payload = entry.kind, entry.payload
+        # 先安排下一次, handler中可以取消或替换该定时器
+        if entry.repeat:
+            # 休眠或关闭后错过多个间隔时只触发一次, 跳到下一个未来的间隔, 保持原来的节奏
+            missed = max(0.0, self._clock() - entry.deadline) // entry.repeat
+            entry.deadline += (missed + 1) * entry.repeat
+            self._push(entry)
+        elif entry.steps:
+            entry.kind, seconds, entry.payload = entry.steps.pop(0)
+            entry.deadline += seconds  # 接着上一步的到期时间, 不累计误差
+            self._push(entry)
+        elif self._named.get(entry.name) is entry:
+            del self._named[entry.name]
+        handler = self._handlers.get(kind)
+        if handler is not None:
+            handler(entry.name, payload)
+
+    def save(self, path):
+        """保存需要保存的命名定时器"""
+        now = self._clock()
+        timers = [
+            {
+                "name": entry.name,
+                "remaining": max(0.0, entry.deadline - now),
+                "kind": entry.kind,
+                "payload": entry.payload,
+                "steps": entry.steps,
+                "repeat": entry.repeat,
+            }
+            for entry in self._named.values()
+            if entry.persist
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": self._wall_clock(), "timers": timers}, f, ensure_ascii=False)
+
+    def load(self, path):
+        """恢复保存的命名定时器, 扣除关闭期间经过的时间, 已过期的步骤在下一次唤醒时依次处理"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        downtime = max(0.0, self._wall_clock() - data["saved_at"])
+        for timer in data["timers"]:
+            self.add(
+                timer["name"],
+                timer["remaining"] - downtime,
+                timer["kind"],
+                timer["payload"],
+                [tuple(step) for step in timer["steps"]],
+                timer["repeat"],
+            )
@@ -0,0 +1,113 @@
+"""
+窗口位置和拖动
+
+- 屏幕和任务栏尺寸缓存, 只在屏幕分辨率变化时重新获取
+- 标题栏高度按是否有边框分别缓存, 只测量一次
+- 拖动时合并鼠标移动事件, 每帧最多移动一次窗口
+- 按钮判断直接使用事件所在组件, 不再查询组件位置
+"""
+
+import tkinter as tk
+
+FRAME_MS = 16  # 拖动时两次移动窗口的最小间隔(毫秒)
+
+
+class WindowPlacement:
+    def __init__(self, root: tk.Tk):
+        self.root = root
+        self._screen = None  # 缓存的屏幕尺寸(宽, 高)
+        self._taskbar_height = 0  # 缓存的任务栏高度
+        self._title_bar_heights = {}  # 是否无边框 -> 标题栏高度
+
+        self._buttons = ()  # 不触发拖动的按钮
+        self._dragging = False
+        self._drag_offset = (0, 0)  # 鼠标相对窗口左上角的位置
+        self._pending_position = None  # 待移动到的位置
+        self._flush_job = None
+
+    def _screen_metrics(self):
+        """屏幕宽高和任务栏高度, 屏幕分辨率变化时才重新获取"""
+        screen = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        if screen != self._screen:
+            self._screen = screen
+            self._taskbar_height = 0
+            try:
+                # 屏幕信息获取, 第一次用到时再导入
+                from win32api import GetMonitorInfo, MonitorFromPoint  # noqa: PLC0415
+            except ImportError:
+                pass
+            else:
+                monitor_info = GetMonitorInfo(MonitorFromPoint((0, 0)))
+                self._taskbar_height = monitor_info.get("Monitor")[3] - monitor_info.get("Work")[3]
+        return self._screen[0], self._screen[1], self._taskbar_height
+
+    def _title_bar_height(self):
+        """标题栏高度, 有边框和无边框各测量一次"""
+        borderless = bool(self.root.overrideredirect())
+        if borderless in self._title_bar_heights:
+            return self._title_bar_heights[borderless]
+        self.root.update_idletasks()
+        height = self.root.winfo_rooty() - self.root.winfo_y()
+        if self.root.winfo_ismapped():  # 窗口显示前测量不准确, 不缓存
+            self._title_bar_heights[borderless] = height
+        return height
+
+    def center(self, window) -> None:
+        """窗口居中"""
+        window.update_idletasks()
+        width = window.winfo_width()
+        height = window.winfo_height()
+        screen_width, screen_height, _ = self._screen_metrics()
+        x = (screen_width // 2) - (width // 2)
+        y = (screen_height // 2) - (height // 2)
+        window.geometry(f"{width}x{height}+{x}+{y}")
+        window.deiconify()
+
+    def bottom_right(self, geometry) -> None:
+        """设置主窗口大小(如"138x138")并移动到右下角"""
+        width, height = (int(value) for value in geometry.split("x"))
+        screen_width, screen_height, taskbar_height = self._screen_metrics()
+        x = screen_width - width
+        y = screen_height - height - self._title_bar_height() - taskbar_height
+        self.root.geometry(f"{width}x{height}+{x}+{y}")
+
+    def enable_drag(self, buttons):
+        """设置拖动功能, 在buttons上按下鼠标不触发拖动"""
+        self._buttons = tuple(buttons)
+        self.root.bind("<ButtonPress-1>", self._start_drag)
+        self.root.bind("<B1-Motion>", self._drag)
+        self.root.bind("<ButtonRelease-1>", self._stop_drag)
+
+    def disable_drag(self):
+        """移除拖动功能"""
+        self._stop_drag()
+        self.root.unbind("<ButtonPress-1>")
+        self.root.unbind("<B1-Motion>")
+        self.root.unbind("<ButtonRelease-1>")
+
+    def _start_drag(self, event):
+        """开始拖动"""
+        if event.widget not in self._buttons:
+            self._dragging = True
+            self._drag_offset = (event.x_root - self.root.winfo_x(), event.y_root - self.root.winfo_y())
+
+    def _drag(self, event):
+        """记录最新位置, 下一帧再移动窗口"""
+        if self._dragging:
+            self._pending_position = (event.x_root - self._drag_offset[0], event.y_root - self._drag_offset[1])
+            if self._flush_job is None:
+                self._flush_job = self.root.after(FRAME_MS, self._flush_position)
+
+    def _stop_drag(self, event=None):
+        """结束拖动, 立即移动到最后的位置"""
+        self._dragging = False
+        if self._flush_job is not None:
+            self.root.after_cancel(self._flush_job)
+        self._flush_position()
+
+    def _flush_position(self):
+        self._flush_job = None
+        if self._pending_position is not None:
+            x, y = self._pending_position
+            self._pending_position = None
+            self.root.geometry(f"+{x}+{y}")
@@ -3,6 +3,14 @@ SqlDict类, 有以下几个方法
 1. 建数据库和表
 2. 导入csv文件
 3. 输入单词(word), 查询单词数据
+4. 预热常查单词: 按查询次数把最常查的单词加载到内存, 查询次数记录在个人数据库(默认 ~/.segment_translator.db)的
+   lookup_stats 表, 不写入词典数据库, 词典可以只读或多人共用
+5. 多词典查询: 传入按优先级排列的多个数据库文件, 通过 ATTACH 挂到同一个连接上,
+   一次 UNION 查询得到优先级最高的词典中的结果, 如团队术语表覆盖 ECDICT,
+   结果中的 dict_index 为所属词典的序号, source 为词典名(数据库文件名, 不含扩展名), 只用于显示
+6. 读取所有词典的单词和查询次数, 供 WordBreaker 拆分组合单词
+7. 压缩存储: _compress_db 把 translation/definition 用 zlib 加共享字典压缩成 BLOB 另存为新数据库,
+   共享字典保存在 sqldict_meta 表, 查询时只解压返回的行; _compare_db 对比压缩前后的文件大小和查询耗时
 
 csv数据来源: https://github.com/skywind3000/ECDICT
 
@@ -31,18 +39,45 @@ csv数据来源: https://github.com/skywind3000/ECDICT
 | 1    | Lemma 的变换形式, 比如 s 代表 apples 是其 lemma 的复数形式 |
 """
 
-import csv
+import os
 import sqlite3
+import zlib
+from collections import Counter
+
+QUERY_BATCH_SIZE = 500  # 批量查询时每次查询的单词数, 不超过SQLite参数数量限制
+DEFAULT_USER_DB = os.path.join(os.path.expanduser("~"), ".segment_translator.db")  # 个人数据库, 保存查询次数
+
+_UPSERT_LOOKUP = """
+INSERT INTO lookup_stats (word, count) VALUES (?, ?)
+ON CONFLICT(word) DO UPDATE SET count = count + excluded.count
+"""
 
 
 class MyDict:
-    def __init__(self, db_file):
-        self.db_file = db_file
+    def __init__(self, db_file, user_db=DEFAULT_USER_DB):
+        """
+        :param db_file: 数据库文件, 或按优先级从高到低排列的数据库文件列表
+        :param user_db: 个人数据库文件, 保存查询次数
+        """
+        self.db_files = [db_file] if isinstance(db_file, str) else list(db_file)
+        self.db_file = self.db_files[0]
+        self.user_db = user_db
+        self.sources = [os.path.splitext(os.path.basename(f))[0] for f in self.db_files]  # 词典名
+        self.schemas = ["main"] + [f"dict{i}" for i in range(1, len(self.db_files))]  # ATTACH后的库名
         self.conn = None
         self.cursor = None
+        self.hot_words = {}  # 预热的常查单词, 单词(小写) -> 单词数据
+        self.lookup_counts = Counter()  # 未保存的查询次数
+        self.zdicts = None  # 每个词典的压缩共享字典, 未压缩的词典为None, 第一次查询时读取
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_file)
+        for db_file, schema in zip(self.db_files[1:], self.schemas[1:], strict=True):
+            conn.execute("ATTACH DATABASE ? AS ?", (db_file, schema))
+        return conn
 
     def connect(self):
-        self.conn = sqlite3.connect(self.db_file)
+        self.conn = self._open()
         self.cursor = self.conn.cursor()
 
     def close(self):
@@ -69,7 +104,20 @@ class MyDict:
         self.conn.commit()
         self.close()
 
+    def _open_user(self):
+        """打开个人数据库, 没有 lookup_stats 表时创建"""
+        conn = sqlite3.connect(self.user_db)
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS "lookup_stats" (
+            "word" VARCHAR(64) COLLATE NOCASE PRIMARY KEY NOT NULL,
+            "count" INTEGER NOT NULL DEFAULT 0
+        );
+        """)
+        return conn
+
     def import_csv(self, csv_file):
+        import csv  # noqa: PLC0415
+
         self.connect()
         with open(csv_file, encoding="utf-8") as f:
             csv_reader = csv.DictReader(f)
@@ -84,31 +132,148 @@ class MyDict:
         self.conn.commit()
         self.close()
 
+    def _load_zdicts(self, cursor):
+        zdicts = []
+        for schema in self.schemas:
+            try:
+                cursor.execute(f"SELECT value FROM {schema}.sqldict_meta WHERE key = 'zdict'")
+                row = cursor.fetchone()
+            except sqlite3.OperationalError:
+                row = None  # 未压缩的词典没有 sqldict_meta 表
+            zdicts.append(row[0] if row else None)
+        self.zdicts = zdicts
+
+    @staticmethod
+    def _decompress(value, zdict):
+        """压缩的字段为BLOB, 未压缩的为TEXT"""
+        if not isinstance(value, bytes):
+            return value
+        decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+        return (decompressor.decompress(value) + decompressor.flush()).decode("utf-8")
+
+    def _row_to_dict(self, result):
+        zdict = self.zdicts[result[0]] if self.zdicts else None
+        # 术语表等只填写了部分字段的词典, 空字段(NULL)统一返回空字符串
+        return {
+            "id": result[1],
+            "word": result[2],
+            "phonetic": result[3] or "",
+            "translation": self._decompress(result[4], zdict) or "",
+            "exchange": result[5] or "",
+            "definition": self._decompress(result[6], zdict) or "",
+            "word_ignored": bool(result[7]),
+            "dict_index": result[0],
+            "source": self.sources[result[0]],
+        }
+
+    def _query(self, cursor, words):
+        """
+        一次查询所有词典, 每个单词只保留优先级最高的结果
+        每个词典一段SELECT, 用UNION ALL合并, 第一列为词典序号(优先级)
+        """
+        if self.zdicts is None:
+            self._load_zdicts(cursor)
+        result = {}
+        for start in range(0, len(words), QUERY_BATCH_SIZE):
+            batch = words[start : start + QUERY_BATCH_SIZE]
+            selects = " UNION ALL ".join(
+                f"SELECT {i}, s.id, s.word, s.phonetic, s.translation, s.exchange, s.definition, s.word_ignored "
+                f"FROM {schema}.sqldict AS s JOIN q ON s.word = q.word"
+                for i, schema in enumerate(self.schemas)
+            )
+            values = ", ".join("(?)" for _ in batch)
+            cursor.execute(f"WITH q(word) AS (VALUES {values}) {selects} ORDER BY 1", batch)
+            for row in cursor:
+                result.setdefault(row[2].lower(), self._row_to_dict(row))
+        return result
+
+    def query_words(self, words):
+        """批量查询, 返回 单词(小写) -> 单词数据, 未找到的单词不在结果中"""
+        found = {}
+        missing = []
+        for word in dict.fromkeys(word.lower() for word in words):
+            if word in self.hot_words:
+                found[word] = self.hot_words[word]
+            else:
+                missing.append(word)
+        if missing:
+            self.connect()
+            found.update(self._query(self.cursor, missing))
+            self.close()
+        self.lookup_counts.update(found.keys())
+        return found
+
     def query_word(self, word):
+        return self.query_words([word]).get(word.lower())
+
+    def update_ignore_status(self, word_id, word_ignored, dict_index=0):
+        """更新忽略状态, dict_index为查询结果中的词典序号, 默认第一个词典"""
         self.connect()
-        self.cursor.execute("SELECT * FROM sqldict WHERE word = ?", (word,))
-        result = self.cursor.fetchone()
-        self.close()
-        if result:
-            return {
-                "id": result[0],
-                "word": result[1],
-                "phonetic": result[2],
-                "translation": result[3],
-                "exchange": result[4],
-                "definition": result[5],
-                "word_ignored": result[6],
-            }
-        return None
-
-    def update_ignore_status(self, word_id, word_ignored):
-        self.connect()
-        self.cursor.execute("UPDATE sqldict SET word_ignored = ? WHERE id = ?", (word_ignored, word_id))
+        self.cursor.execute(
+            f"UPDATE {self.schemas[dict_index]}.sqldict SET word_ignored = ? WHERE id = ?", (word_ignored, word_id)
+        )
         self.conn.commit()
         self.close()
+        for word_info in self.hot_words.values():
+            if word_info["id"] == word_id and word_info["dict_index"] == dict_index:
+                word_info["word_ignored"] = word_ignored
+
+    def save_lookup_counts(self):
+        """把查询次数累加到个人数据库的 lookup_stats 表, 写入失败时保留, 下次再保存"""
+        if not self.lookup_counts:
+            return
+        try:
+            conn = self._open_user()
+            try:
+                with conn:
+                    conn.executemany(_UPSERT_LOOKUP, self.lookup_counts.items())
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return  # 查询次数只影响预热, 不影响查询
+        self.lookup_counts.clear()
+
+    def _load_lookup_counts(self, limit=None):
+        """读取个人数据库中的查询次数, 按次数从多到少排列, 读取失败时返回空列表"""
+        try:
+            conn = self._open_user()
+            try:
+                sql = "SELECT word, count FROM lookup_stats ORDER BY count DESC LIMIT ?"
+                return conn.execute(sql, (-1 if limit is None else limit,)).fetchall()  # LIMIT -1 表示不限制
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return []
+
+    def warm_up(self, limit=2000):
+        """
+        按查询次数加载最常查的单词到内存, 同时把对应的数据库页读入系统缓存
+        在后台线程调用, 使用独立的连接, 加载完成后整体替换 hot_words
+        """
+        words = [word.lower() for word, _ in self._load_lookup_counts(limit)]
+        if not words:
+            return  # 还没有查询记录
+        conn = self._open()
+        try:
+            hot_words = self._query(conn.cursor(), words)
+        finally:
+            conn.close()
+        self.hot_words = hot_words
+
+    def load_words(self):
+        """读取所有词典的单词和查询次数, 返回(单词列表, 单词(小写) -> 查询次数)"""
+        conn = self._open()
+        try:
+            words = [row[0] for schema in self.schemas for row in conn.execute(f"SELECT word FROM {schema}.sqldict")]
+        finally:
+            conn.close()
+        counts = {word.lower(): count for word, count in self._load_lookup_counts()}
+        return words, counts
 
 
 def _transfer_csv(input_file, output_file, columns_to_keep):
+    import csv  # noqa: PLC0415
+
     with open(input_file, encoding="utf-8") as infile, open(output_file, "w", encoding="utf-8", newline="") as outfile:
         reader = csv.reader(infile)
         writer = csv.writer(outfile)
@@ -117,8 +282,90 @@ def _transfer_csv(input_file, output_file, columns_to_keep):
             writer.writerow(new_row)
 
 
+def _train_zdict(samples, size=32 * 1024):
+    """
+    从样本中统计重复出现的片段作为zlib共享字典
+    zlib优先匹配字典末尾的内容, 所以收益越大的片段越靠后
+    """
+    import re  # noqa: PLC0415
+
+    counts = Counter()
+    for text in samples:
+        counts.update(re.findall(r"\S+\s?", text))
+    pieces = []
+    total = 0
+    for piece, count in sorted(counts.items(), key=lambda item: item[1] * len(item[0]), reverse=True):
+        if count < 2 or total >= size:
+            break
+        encoded = piece.encode("utf-8")
+        pieces.append(encoded)
+        total += len(encoded)
+    return b"".join(reversed(pieces))[-size:]
+
+
+def _compress_db(input_file, output_file, level=9, sample_step=50):
+    """
+    把 translation/definition 压缩后另存为新数据库, 每 sample_step 行取一行作为训练共享字典的样本
+    输出文件确认无误后需要重命名为原文件名(如 sqldict.db), 程序按文件名加载词典, 词典名列也显示文件名
+    """
+    if os.path.exists(output_file):
+        raise FileExistsError(output_file)
+    src = sqlite3.connect(input_file)
+    samples = []
+    rows = src.execute("SELECT translation, definition FROM sqldict WHERE id % ? = 0", (sample_step,))
+    for translation, definition in rows:
+        samples.extend(text for text in (translation, definition) if text)
+    zdict = _train_zdict(samples)
+
+    def compress(text):
+        if not text:
+            return text
+        compressor = zlib.compressobj(level, zdict=zdict)
+        return compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+    MyDict(output_file).create_table()
+    dst = sqlite3.connect(output_file)
+    dst.execute('CREATE TABLE IF NOT EXISTS "sqldict_meta" ("key" VARCHAR(16) PRIMARY KEY NOT NULL, "value" BLOB)')
+    dst.execute("INSERT INTO sqldict_meta (key, value) VALUES ('zdict', ?)", (zdict,))
+    rows = src.execute("SELECT id, word, phonetic, translation, exchange, definition, word_ignored FROM sqldict")
+    dst.executemany(
+        """
+    INSERT INTO sqldict (id, word, phonetic, translation, exchange, definition, word_ignored)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+        (
+            (word_id, word, phonetic, compress(translation), exchange, compress(definition), word_ignored)
+            for word_id, word, phonetic, translation, exchange, definition, word_ignored in rows
+        ),
+    )
+    dst.commit()
+    dst.execute("VACUUM")
+    dst.close()
+    src.close()
+
+
+def _compare_db(plain_file, compressed_file, sample_size=2000):
+    """对比压缩前后的文件大小和逐个单词查询的平均耗时"""
+    import random  # noqa: PLC0415
+    import time  # noqa: PLC0415
+
+    conn = sqlite3.connect(plain_file)
+    words = [row[0] for row in conn.execute("SELECT word FROM sqldict")]
+    conn.close()
+    words = random.sample(words, min(sample_size, len(words)))
+    for db_file in (plain_file, compressed_file):
+        sql_dict = MyDict(db_file)
+        start = time.perf_counter()
+        for word in words:
+            sql_dict.query_word(word)
+        elapsed = time.perf_counter() - start
+        print(f"{db_file}: {os.path.getsize(db_file) / 1024 / 1024:.1f} MB, 平均查询 {elapsed / len(words) * 1000:.3f} ms")
+
+
 if __name__ == "__main__":
     # _transfer_csv("stardict.csv", "data.csv", [0, 1, 3, 10, 2])  # 修改源文件格式
+    # _compress_db("sqldict.db", "sqldict_z.db")  # 压缩数据库, 确认无误后把 sqldict_z.db 重命名为 sqldict.db
+    # _compare_db("sqldict.db", "sqldict_z.db")  # 对比压缩前后的大小和查询耗时
     sql_dict = MyDict("sqldict.db")  # 打开数据库
     # sql_dict.create_table()  # 创建表
     # sql_dict.import_csv("data.csv")  # 导入数据
@@ -1,11 +1,15 @@
-import csv
+# ruff: noqa: E402
+import time
+
+startup_time = time.perf_counter()  # 启动时间, --profile-startup 统计导入耗时
+
 import os
 import re
 import sys
-import time
+import threading
 
 from MyDict import MyDict
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QApplication,
@@ -21,6 +25,7 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
+from WordBreaker import WordBreaker
 
 # pyinstaller -n SegmentTranslator --add-data "MyDict.py;." -F -w .\SegmentTranslator.py
 
@@ -40,6 +45,9 @@ UNCHECKED_SYMBOL = "☐"  # 未勾选符号
 CHECKED_SYMBOL = "☑"  # 已勾选符号
 ADD_SYMBOL = "+"
 ADDED_SYMBOL = "✓"
+WARM_UP_SIZE = 2000  # 启动后预热的常查单词数量, 为0时不预热
+WORD_BREAK = True  # 是否拆分词典中没有的组合单词, 如 filesystem -> file system
+DICT_FILES = ["glossary.db", "sqldict.db"]  # 词典数据库, 按优先级从高到低排列, 不存在的文件会跳过
 
 
 STYLE = """
@@ -82,6 +90,7 @@ class SegmentTranslator(QMainWindow):
         self.setStyleSheet(STYLE)
         self.create_widgets()
         self.sql_dict = my_dict
+        self.word_breaker = None  # 后台线程加载完成前为None, 不拆分
         self.wordbook = {}
 
     def create_widgets(self):
@@ -117,13 +126,14 @@ class SegmentTranslator(QMainWindow):
         # 创建翻译结果表格
         self.translation_table = QTreeWidget()
         self.translation_table.setAlternatingRowColors(False)
-        self.translation_table.setHeaderLabels(["单词", "音标", "翻译", "变形", "忽略", "记录"])
+        self.translation_table.setHeaderLabels(["单词", "音标", "翻译", "变形", "忽略", "记录", "词典"])
         self.translation_table.setColumnWidth(0, 160)  # 设置列宽
         self.translation_table.setColumnWidth(1, 160)
         self.translation_table.setColumnWidth(2, 600)
         self.translation_table.setColumnWidth(3, 200)
         self.translation_table.setColumnWidth(4, 60)
         self.translation_table.setColumnWidth(5, 20)
+        self.translation_table.setColumnWidth(6, 80)
         self.translation_table.setIndentation(0)  # 设置不缩进
         layout.addWidget(self.translation_table)
         # 绑定点击忽略列事件(另一个实现思路: 使用QTreeWidget.setItemWidget在最后一列绑定QPushButton按钮)
@@ -138,6 +148,16 @@ class SegmentTranslator(QMainWindow):
         self.unknown_words_display.setVisible(False)
         layout.addWidget(self.unknown_words_display)
 
+    def start_warm_up(self):
+        """窗口显示后在后台线程预热常查单词, 加载组合单词拆分的词表"""
+        threading.Thread(target=self._warm_up, daemon=True).start()
+
+    def _warm_up(self):
+        if WARM_UP_SIZE > 0:
+            self.sql_dict.warm_up(WARM_UP_SIZE)
+        if WORD_BREAK:
+            self.word_breaker = WordBreaker(*self.sql_dict.load_words())
+
     def handle_item_click(self, item, column):
         if column == 4:
             self.toggle_ignore_word(item)
@@ -165,12 +185,13 @@ class SegmentTranslator(QMainWindow):
     def toggle_ignore_word(self, item):
         current_status = item.text(4)
         word_id = item.data(0, Qt.ItemDataRole.UserRole)
+        dict_index = item.data(6, Qt.ItemDataRole.UserRole)
         if current_status == UNCHECKED_SYMBOL:
             new_status = CHECKED_SYMBOL
-            self.sql_dict.update_ignore_status(word_id, True)
+            self.sql_dict.update_ignore_status(word_id, True, dict_index)
         else:
             new_status = UNCHECKED_SYMBOL
-            self.sql_dict.update_ignore_status(word_id, False)
+            self.sql_dict.update_ignore_status(word_id, False, dict_index)
         item.setText(4, new_status)
 
     @staticmethod
@@ -204,13 +225,29 @@ class SegmentTranslator(QMainWindow):
 
         show_ignore_words = self.show_ignored_words_checkbox.isChecked()
         unknown_words = []
+        found = self.sql_dict.query_words(words)  # 所有词典一次查询
+        # 词典中没有的单词尝试拆分成多个单词, 拆出的单词再一次查询
+        word_breaker = self.word_breaker
+        split_words = {}
         for word in words:
-            word_info = self.sql_dict.query_word(word)
-            if word_info:
-                if show_ignore_words or not word_info["word_ignored"]:
+            if word not in found and word_breaker is not None:
+                pieces = word_breaker.split(word)
+                if pieces:
+                    split_words[word] = pieces
+        if split_words:
+            found.update(self.sql_dict.query_words([p for pieces in split_words.values() for p in pieces]))
+
+        shown_words = set()
+        for word in words:
+            for w in split_words.get(word, (word,)):
+                word_info = found.get(w)
+                if not word_info:
+                    unknown_words.append(word)
+                    break
+                if w not in shown_words and (show_ignore_words or not word_info["word_ignored"]):
+                    shown_words.add(w)
                     self.add_word_to_table(word_info)
-            else:
-                unknown_words.append(word)
+        self.sql_dict.save_lookup_counts()
 
         if unknown_words:
             # 如果有未知单词，显示它们
@@ -239,6 +276,8 @@ class SegmentTranslator(QMainWindow):
         item.setText(3, "\n".join(formatted_exchange))
         item.setText(4, CHECKED_SYMBOL if word_info["word_ignored"] else UNCHECKED_SYMBOL)
         item.setText(5, ADDED_SYMBOL if word_info["word"] in self.wordbook else ADD_SYMBOL)
+        item.setText(6, word_info["source"])
+        item.setData(6, Qt.ItemDataRole.UserRole, word_info["dict_index"])  # 词典序号, 词典名可能重复
         self.translation_table.addTopLevelItem(item)
 
 
@@ -279,6 +318,8 @@ class WordbookDialog(QDialog):
             QMessageBox.warning(self, "警告", "单词本为空")
             return
 
+        import csv  # 导出时才用到, 不在启动时导入  # noqa: PLC0415
+
         path = os.path.join(
             os.path.expanduser("~/Desktop"),
             "wordbook-{}.csv".format(time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())),
@@ -294,9 +335,35 @@ class WordbookDialog(QDialog):
             QMessageBox.critical(self, "错误", f"导出失败：{str(e)}")
 
 
+def existing_dict_files():
+    """存在的词典文件, 都不存在时使用最后一个(ECDICT)"""
+    return [f for f in DICT_FILES if os.path.exists(f)] or DICT_FILES[-1:]
+
+
+def profile_startup():
+    """统计启动各阶段耗时, 输出后退出"""
+    imported = time.perf_counter()
+    app = QApplication(sys.argv)
+    app.setStyle("fusion")
+    dictionary_app = SegmentTranslator(MyDict(existing_dict_files()))
+    created = time.perf_counter()
+    dictionary_app.show()
+    app.processEvents()  # 处理绘制事件
+    painted = time.perf_counter()
+    print("启动耗时(毫秒):")
+    print(f"  导入模块: {(imported - startup_time) * 1000:.1f}")
+    print(f"  创建窗口: {(created - imported) * 1000:.1f}")
+    print(f"  首次绘制: {(painted - created) * 1000:.1f}")
+    print(f"  合计: {(painted - startup_time) * 1000:.1f}")
+
+
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv[1:]:
+        profile_startup()
+        sys.exit()
     app = QApplication(sys.argv)
     app.setStyle("fusion")
-    dictionary_app = SegmentTranslator(MyDict("sqldict.db"))
+    dictionary_app = SegmentTranslator(MyDict(existing_dict_files()))
     dictionary_app.show()
+    QTimer.singleShot(0, dictionary_app.start_warm_up)  # 不推迟首次绘制
     sys.exit(app.exec())
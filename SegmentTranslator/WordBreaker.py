@@ -0,0 +1,60 @@
+"""
+WordBreaker类, 把没有大小写和分隔符的组合单词拆成词典中的单词, 如 filesystem -> file system
+
+- 词表来自 sqldict 的 word 列, 只保留纯字母单词, 存在集合(哈希表)中, 每个子串查找 O(1)
+- 动态规划: 拆出的单词越少越好, 单词数相同时优先查询次数多、长度长的单词
+- 拆分结果按单词缓存, 同一个单词只计算一次
+"""
+
+import math
+from functools import lru_cache
+
+MAX_WORD_LENGTH = 24  # 参与拆分的单词最大长度
+SINGLE_LETTER_WORDS = {"a", "i"}  # 允许单独拆出的单字母单词
+
+
+class WordBreaker:
+    def __init__(self, words, lookup_counts=None):
+        """
+        :param words: 词典单词
+        :param lookup_counts: 单词(小写) -> 查询次数, 用于在拆分数量相同的方案中选择
+        """
+        lookup_counts = lookup_counts or {}
+        self.weights = {}  # 单词 -> 权重, 只在拆出的单词数相同时比较, 常查和较长的单词权重高
+        for word in words:
+            lower = word.lower()
+            if not lower.isascii() or not lower.isalpha() or len(lower) > MAX_WORD_LENGTH:
+                continue
+            if len(lower) == 1 and lower not in SINGLE_LETTER_WORDS:
+                continue
+            self.weights[lower] = math.log1p(lookup_counts.get(lower, 0)) + 0.01 * len(lower)
+        self.split = lru_cache(maxsize=65536)(self._split)
+
+    def _split(self, token):
+        """拆分单词, 无法完整拆成两个及以上的词典单词时返回空元组"""
+        token = token.lower()
+        n = len(token)
+        # best_cost[i]: token[:i] 的最小代价(单词数, -权重和), 按元组比较, 单词数少的方案总是优先
+        best_cost = [(0, 0.0)] + [(math.inf, 0.0)] * n
+        best_start = [0] * (n + 1)  # best_start[i]: token[:i] 最后一个单词的起始位置
+        for end in range(1, n + 1):
+            for start in range(max(0, end - MAX_WORD_LENGTH), end):
+                piece_count, weight = best_cost[start]
+                if piece_count == math.inf:
+                    continue
+                word_weight = self.weights.get(token[start:end])
+                if word_weight is None:
+                    continue
+                cost = (piece_count + 1, weight - word_weight)
+                if cost < best_cost[end]:
+                    best_cost[end] = cost
+                    best_start[end] = start
+        if best_cost[n][0] == math.inf:
+            return ()
+        pieces = []
+        end = n
+        while end > 0:
+            start = best_start[end]
+            pieces.append(token[start:end])
+            end = start
+        return tuple(reversed(pieces)) if len(pieces) > 1 else ()
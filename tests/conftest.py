@@ -0,0 +1,8 @@
+import os
+import sys
+
+# 各工具的模块按脚本方式互相导入(如 from TimerEngine import TimerEngine), 测试时把工具目录加入路径
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for tool_dir in ("PomodoroTimer", "SegmentTranslator"):
+    sys.path.insert(0, os.path.join(ROOT, tool_dir))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,40 @@
+"""假的Tk事件循环, 提供 after / after_cancel 和可手动推进的单调时钟"""
+
+import heapq
+import itertools
+
+
+class FakeLoop:
+    def __init__(self, now=100.0):
+        self.now = now
+        self._pending = []  # (到期时间, 序号, 句柄)
+        self._counter = itertools.count()
+        self._cancelled = set()
+        self.scheduled = 0  # after调用次数
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, callback):
+        handle = next(self._counter)
+        heapq.heappush(self._pending, (self.now + ms / 1000, handle, callback))
+        self.scheduled += 1
+        return handle
+
+    def after_cancel(self, handle):
+        self._cancelled.add(handle)
+
+    def pending(self):
+        """未取消的定时数量"""
+        return sum(1 for _, handle, _ in self._pending if handle not in self._cancelled)
+
+    def advance(self, seconds):
+        """推进时钟, 依次执行到期的回调, 回调中可以再次调用advance(模拟wait_window等嵌套事件循环)"""
+        target = self.now + seconds
+        while self._pending and self._pending[0][0] <= target:
+            due, handle, callback = heapq.heappop(self._pending)
+            if handle in self._cancelled:
+                continue
+            self.now = max(self.now, due)
+            callback()
+        self.now = max(self.now, target)
@@ -0,0 +1,98 @@
+import io
+import threading
+import unittest
+import wave
+from unittest import mock
+
+from AlertBackend import (
+    AlertBackend,
+    LinuxAlertBackend,
+    NullAlertBackend,
+    ThreadedAlertBackend,
+)
+
+
+def make_wav(sample_width=2, channels=1, rate=8000, frames=b"\x01\x02" * 4):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setsampwidth(sample_width)
+        wav.setnchannels(channels)
+        wav.setframerate(rate)
+        wav.writeframes(frames)
+    return buffer.getvalue()
+
+
+class BlockingAlertBackend(ThreadedAlertBackend):
+    """第一次播放时阻塞, 直到release, 用于测试播放中的提醒合并"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.finished = threading.Semaphore(0)
+        self.play_count = 0
+        super().__init__()
+
+    def _play_buffer(self):
+        self.play_count += 1
+        self.started.set()
+        self.release.wait(5)
+        self.finished.release()
+
+
+class AlertBackendTest(unittest.TestCase):
+    def test_interface_is_abstract(self):
+        with self.assertRaises(TypeError):
+            AlertBackend()
+        with self.assertRaises(TypeError):
+            ThreadedAlertBackend()
+
+    def test_null_backend_counts_plays(self):
+        backend = NullAlertBackend()
+        backend.play()
+        backend.play()
+        backend.close()
+        self.assertEqual(backend.play_count, 2)
+
+    def test_plays_while_playing_are_merged(self):
+        backend = BlockingAlertBackend()
+        backend.play()
+        self.assertTrue(backend.started.wait(5))
+        for _ in range(5):
+            backend.play()  # 只保留一次待播放
+        backend.close()  # 队列已满, 结束请求被丢弃
+        backend.release.set()
+        self.assertTrue(backend.finished.acquire(timeout=5))
+        self.assertTrue(backend.finished.acquire(timeout=5))
+        backend.close()
+        backend._thread.join(5)
+        self.assertFalse(backend._thread.is_alive())
+        self.assertEqual(backend.play_count, 2)
+
+
+class LinuxAlertBackendTest(unittest.TestCase):
+    def backend(self, data, players=("aplay", "pacat")):
+        with mock.patch("shutil.which", side_effect=lambda name: f"/usr/bin/{name}" if name in players else None):
+            backend = LinuxAlertBackend(data)
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_decodes_wav_once(self):
+        backend = self.backend(make_wav(sample_width=2, channels=2, rate=22050, frames=b"\x00\x01\x02\x03" * 3))
+        self.assertEqual(backend.frames, b"\x00\x01\x02\x03" * 3)
+        self.assertEqual(backend.command, ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "2", "-r", "22050"])
+
+    def test_falls_back_to_pacat(self):
+        backend = self.backend(make_wav(sample_width=1, frames=b"\x80" * 4), players=("pacat",))
+        self.assertEqual(backend.command, ["pacat", "--format=u8", "--channels=1", "--rate=8000"])
+
+    def test_rejects_unsupported_data(self):
+        with self.assertRaises(OSError):
+            self.backend(b"not a wav file")
+        with self.assertRaises(OSError):
+            self.backend(make_wav(sample_width=3, frames=b"\x00" * 6))
+        with self.assertRaises(OSError):
+            self.backend(make_wav(), players=())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+
+from Lottery import LotterySession, prepare_roster
+
+
+class PrepareRosterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp.name, "lottery.txt")
+        self.report = os.path.join(self.tmp.name, "report.txt")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def prepare(self, *contents):
+        paths = []
+        for i, content in enumerate(contents):
+            paths.append(os.path.join(self.tmp.name, f"input{i}.txt"))
+            with open(paths[-1], "w", encoding="utf-8") as file:
+                file.write(content)
+        counts = prepare_roster(paths, self.output, self.report)
+        with open(self.output, encoding="utf-8") as file:
+            roster = [line.rstrip("\n").split("\t") for line in file]
+        with open(self.report, encoding="utf-8") as file:
+            report = [line.rstrip("\n").split("\t") for line in file]
+        return counts, roster, report
+
+    def test_skip_headers_in_every_file(self):
+        counts, roster, report = self.prepare("工号,姓名\n1,张三\n", "ID\tName\n2\t李四\n")
+        self.assertEqual(roster, [["1", "张三"], ["2", "李四"]])
+        self.assertEqual(counts, (2, 0, 0, 0))
+        self.assertEqual(report, [])
+
+    def test_blank_id_gets_unused_number(self):
+        counts, roster, _ = self.prepare("1,张三\n \t李四\n王五\n2,赵六\n")
+        self.assertEqual(roster, [["1", "张三"], ["3", "李四"], ["4", "王五"], ["2", "赵六"]])
+
+    def test_extra_columns_are_ignored(self):
+        _, roster, _ = self.prepare("1,张三,销售部,北京\n2\t李四\t研发部\n")
+        self.assertEqual(roster, [["1", "张三"], ["2", "李四"]])
+
+    def test_full_width_and_spaces_are_normalized(self):
+        counts, roster, report = self.prepare("１，张三\n", "1,  张三 \n3\tＡｌｉｃｅ　Ｌｅｅ\n3\talice lee\n")
+        self.assertEqual(roster, [["1", "张三"], ["3", "Alice Lee"]])
+        self.assertEqual(counts, (2, 2, 0, 0))
+        self.assertEqual([(row[0], row[2], row[4]) for row in report], [("1", "2", "重复"), ("3", "2", "重复")])
+
+    def test_same_id_with_different_names_keeps_both(self):
+        counts, roster, report = self.prepare("7,张三\n7,李四\n7,张三\n")
+        self.assertEqual(roster, [["7", "张三"], ["7", "李四"]])
+        self.assertEqual(counts, (2, 1, 1, 0))
+        self.assertEqual(report[1][:3], ["7", "张三 / 李四", "3"])
+        self.assertEqual(report[1][4], "ID冲突")
+
+    def test_comma_in_plain_name_is_kept(self):
+        _, roster, _ = self.prepare("Smith, John\n5,Doe, Jane\n")
+        self.assertEqual(roster, [["1", "Smith, John"], ["5", "Doe"]])
+
+    def test_name_without_id_matching_id_entry_is_reported(self):
+        counts, roster, report = self.prepare("1,张三\n张三\n")
+        self.assertEqual(roster, [["1", "张三"], ["2", "张三"]])
+        self.assertEqual(counts, (2, 0, 0, 1))
+        self.assertEqual(report[0][4], "无ID同名")
+
+
+class LotterySessionTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal = os.path.join(self.tmp.name, "journal.txt")
+        self.names = [f"{i} 名字{i}" for i in range(20)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rounds_exclude_previous_winners_and_resume(self):
+        session = LotterySession(self.names, self.journal)
+        first = session.draw(5)
+        second = session.draw(5)
+        self.assertFalse(set(first) & set(second))
+        self.assertEqual(session.remaining(), 10)
+        restored = LotterySession(self.names, self.journal)
+        self.assertEqual(restored.round, 2)
+        self.assertEqual(restored.winners, set(first) | set(second))
+        self.assertEqual(sorted(restored.pool), sorted(session.pool))
+
+    def test_reject_zero_and_too_many(self):
+        session = LotterySession(self.names, self.journal)
+        with self.assertRaises(ValueError):
+            session.draw(0)
+        with self.assertRaises(ValueError):
+            session.draw(21)
+        self.assertEqual(session.round, 0)
+        self.assertFalse(os.path.exists(self.journal))
+
+    def test_journal_failure_keeps_pool(self):
+        session = LotterySession(self.names, os.path.join(self.tmp.name, "missing", "journal.txt"))
+        with self.assertRaises(OSError):
+            session.draw(5)
+        self.assertEqual(session.remaining(), 20)
+        self.assertEqual(session.winners, set())
+        self.assertEqual(session.round, 0)
+
+    def test_torn_journal_is_repaired_before_next_round(self):
+        with open(self.journal, "w", encoding="utf-8") as file:
+            file.write("0 名字0\n\n1 名字1\n2 名字")  # 第二轮写到一半崩溃
+        session = LotterySession(self.names, self.journal)
+        self.assertEqual(session.round, 2)
+        self.assertEqual(session.winners, {"0 名字0", "1 名字1"})
+        winners = session.draw(1)
+        restored = LotterySession(self.names, self.journal)
+        self.assertEqual(restored.round, 3)
+        self.assertEqual(restored.winners, {"0 名字0", "1 名字1", *winners})
+
+    def test_unknown_journal_names_and_merged_names(self):
+        with open(self.journal, "w", encoding="utf-8") as file:
+            file.write("不在名单中\n0 名字0\n\n")
+        session = LotterySession([*self.names, "0 名字0", "", "1 名字1"], self.journal)
+        self.assertEqual(session.merged, 2)
+        self.assertEqual(session.winners, {"0 名字0"})
+        self.assertEqual(session.remaining(), 19)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from MyDict import MyDict, _compress_db
+
+
+def make_dict(path, words):
+    MyDict(path).create_table()
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO sqldict (word, phonetic, translation, exchange, definition) VALUES (?, '', ?, '', '')", words
+    )
+    conn.commit()
+    conn.close()
+
+
+class MyDictTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmp.name, "team"))
+        self.glossary = os.path.join(self.tmp.name, "team", "sqldict.db")
+        self.ecdict = os.path.join(self.tmp.name, "sqldict.db")  # 与术语表同名
+        self.user_db = os.path.join(self.tmp.name, "user.db")
+        make_dict(self.glossary, [("token", "令牌")])
+        make_dict(self.ecdict, [("token", "标记"), ("file", "文件")])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+class MyDictUserStateTest(MyDictTestCase):
+    def test_lookup_counts_saved_in_user_db(self):
+        sql_dict = MyDict([self.glossary, self.ecdict], user_db=self.user_db)
+        sql_dict.query_words(["token", "file"])
+        sql_dict.query_word("file")
+        sql_dict.save_lookup_counts()
+        self.assertFalse(sql_dict.lookup_counts)
+        self.assertEqual(sql_dict.load_words()[1], {"token": 1, "file": 2})
+        for path in (self.glossary, self.ecdict):
+            conn = sqlite3.connect(path)
+            tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+            conn.close()
+            self.assertNotIn("lookup_stats", tables)
+
+    def test_update_ignore_status_uses_dict_index(self):
+        sql_dict = MyDict([self.glossary, self.ecdict], user_db=self.user_db)
+        sql_dict.query_words(["token", "file"])
+        sql_dict.save_lookup_counts()
+        sql_dict.warm_up()
+        found = sql_dict.query_words(["token", "file"])
+        self.assertEqual(found["token"]["dict_index"], 0)
+        self.assertEqual(found["file"]["dict_index"], 1)
+        self.assertEqual(found["token"]["source"], found["file"]["source"])
+        sql_dict.update_ignore_status(found["file"]["id"], True, found["file"]["dict_index"])
+        self.assertTrue(sql_dict.hot_words["file"]["word_ignored"])
+        sql_dict.hot_words = {}
+        found = sql_dict.query_words(["token", "file"])
+        self.assertTrue(found["file"]["word_ignored"])
+        self.assertFalse(found["token"]["word_ignored"])
+
+    def test_glossary_with_only_word_and_translation(self):
+        glossary = os.path.join(self.tmp.name, "glossary.db")
+        MyDict(glossary).create_table()
+        conn = sqlite3.connect(glossary)
+        conn.execute("INSERT INTO sqldict (word, translation) VALUES ('token', '令牌')")
+        conn.commit()
+        conn.close()
+        word_info = MyDict([glossary, self.ecdict], user_db=self.user_db).query_word("token")
+        self.assertEqual(word_info["translation"], "令牌")
+        for column in ("phonetic", "exchange", "definition"):
+            self.assertEqual(word_info[column], "")
+        self.assertEqual(word_info["exchange"].split("/"), [""])
+        self.assertFalse(word_info["word_ignored"])
+
+
+class MyDictCompressTest(MyDictTestCase):
+    def test_compressed_db_returns_same_text(self):
+        compressed = os.path.join(self.tmp.name, "sqldict_z.db")
+        _compress_db(self.ecdict, compressed, sample_step=1)
+        found = MyDict(compressed, user_db=self.user_db).query_words(["token", "file"])
+        self.assertEqual(found["token"]["translation"], "标记")
+        self.assertEqual(found["file"]["translation"], "文件")
+        with self.assertRaises(FileExistsError):
+            _compress_db(self.ecdict, compressed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import csv
+import os
+import tempfile
+import time
+import unittest
+
+from SessionHistory import SessionHistory
+
+# 2024-01-01 是周一, 和2023-12-31(周日)不在同一ISO周
+MONDAY_NOON = time.mktime((2024, 1, 1, 12, 0, 0, 0, 0, -1))
+SUNDAY_NOON = MONDAY_NOON - 86400
+
+
+class SessionHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history = SessionHistory(os.path.join(self.tmp.name, "history.db"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_record_updates_day_and_week(self):
+        self.history.record("work", "completed", 1500, ended_at=MONDAY_NOON)
+        self.history.record("rest", "completed", 300, ended_at=MONDAY_NOON + 300)
+        self.history.record("work", "paused", 600.4, ended_at=MONDAY_NOON + 1200)
+        self.assertEqual(self.history.query_day("2024-01-01"), (2100, 1, 1))
+        self.assertEqual(self.history.query_week("2024-W01"), (2100, 1, 1))
+        self.history.connect()
+        self.history.cursor.execute("SELECT kind, outcome, started_at, ended_at, seconds FROM sessions ORDER BY id")
+        sessions = self.history.cursor.fetchall()
+        self.history.close()
+        self.assertEqual(sessions[0], ("work", "completed", "2024-01-01 11:35:00", "2024-01-01 12:00:00", 1500))
+        self.assertEqual(sessions[2][4], 600)
+
+    def test_only_work_interruptions_are_counted(self):
+        self.history.record("rest", "paused", 60, ended_at=MONDAY_NOON)
+        self.history.record("rest", "reset", 60, ended_at=MONDAY_NOON)
+        self.history.record("work", "reset", 60, ended_at=MONDAY_NOON)
+        self.assertEqual(self.history.query_day("2024-01-01"), (60, 0, 1))
+
+    def test_days_and_weeks_are_separate(self):
+        self.history.record("work", "completed", 1500, ended_at=SUNDAY_NOON)
+        self.history.record("work", "completed", 1500, ended_at=MONDAY_NOON)
+        self.assertEqual(self.history.query_day("2023-12-31"), (1500, 1, 0))
+        self.assertEqual(self.history.query_week("2023-W52"), (1500, 1, 0))
+        self.assertEqual(self.history.query_week("2024-W01"), (1500, 1, 0))
+        self.assertEqual(self.history.query_day("2024-01-02"), (0, 0, 0))
+        self.assertEqual([row[0] for row in self.history.recent_days()], ["2024-01-01", "2023-12-31"])
+
+    def test_export_csv(self):
+        self.history.record("work", "completed", 1500, ended_at=MONDAY_NOON)
+        self.history.record("work", "reset", 90, ended_at=SUNDAY_NOON)
+        path = os.path.join(self.tmp.name, "stats.csv")
+        self.history.export_csv(path)
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["日期", "专注分钟", "完成番茄数", "中断次数"])
+        self.assertEqual(rows[1:], [["2023-12-31", "1.5", "0", "1"], ["2024-01-01", "25.0", "1", "0"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
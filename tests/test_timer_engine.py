@@ -0,0 +1,108 @@
+import unittest
+
+from fake_loop import FakeLoop
+from TimerEngine import REST_STATE, WORK_STATE, TimerEngine
+
+
+class TimerEngineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = FakeLoop()
+        self.engine = TimerEngine(self.loop.after, self.loop.after_cancel, clock=self.loop.clock)
+        self.events = []
+        self.engine.subscribe(lambda event, engine: self.events.append(event))
+
+
+class TimerEngineTickTest(TimerEngineTestCase):
+    def test_one_wakeup_per_displayed_second(self):
+        self.engine.start(5)
+        self.assertEqual(self.loop.scheduled, 1)
+        self.loop.advance(3)
+        self.assertEqual(self.loop.scheduled, 4)
+        self.assertEqual(self.engine.displayed, 2)
+        self.assertEqual(self.events.count("tick"), 4)  # 5, 4, 3, 2
+        self.assertEqual(self.loop.pending(), 1)
+
+    def test_restored_countdown_wakes_on_second_boundary(self):
+        self.engine.restore(WORK_STATE, 2.5)
+        self.assertEqual(self.engine.time_left(), 2.5)
+        self.engine.start(60)
+        self.assertEqual(self.engine.displayed, 3)
+        self.loop.advance(0.5)
+        self.assertEqual(self.engine.displayed, 2)
+        self.assertEqual(self.loop.scheduled, 2)
+
+
+class TimerEnginePauseTest(TimerEngineTestCase):
+    def test_pause_and_resume_keeps_remaining(self):
+        self.engine.start(10)
+        self.loop.advance(4)
+        self.engine.pause()
+        self.assertFalse(self.engine.is_running)
+        self.assertEqual(self.engine.remaining, 6)
+        self.assertEqual(self.engine.elapsed, 4)
+        self.assertEqual(self.loop.pending(), 0)
+        self.loop.advance(100)  # 暂停期间不计时
+        self.assertEqual(self.engine.remaining, 6)
+        self.engine.start(10)  # 继续计时, 忽略duration
+        self.loop.advance(5)
+        self.assertEqual(self.engine.displayed, 1)
+        self.assertTrue(self.engine.is_running)
+
+    def test_pause_when_not_running_does_nothing(self):
+        self.engine.pause()
+        self.assertEqual(self.events, [])
+
+
+class TimerEngineFinishTest(TimerEngineTestCase):
+    def test_finish_switches_state(self):
+        self.engine.start(3)
+        self.loop.advance(3)
+        self.assertEqual(self.events[-1], "finished")
+        self.assertEqual(self.engine.ended_state, WORK_STATE)
+        self.assertEqual(self.engine.state, REST_STATE)
+        self.assertFalse(self.engine.is_running)
+        self.assertEqual(self.engine.displayed, 0)
+        self.assertEqual(self.engine.elapsed, 3)
+        self.assertEqual(self.loop.pending(), 0)
+        self.engine.start(2)
+        self.loop.advance(2)
+        self.assertEqual(self.engine.ended_state, REST_STATE)
+        self.assertEqual(self.engine.state, WORK_STATE)
+
+    def test_reset_returns_to_work(self):
+        self.engine.start(3)
+        self.loop.advance(3)
+        self.engine.start(2)
+        self.loop.advance(1)
+        self.engine.reset()
+        self.assertEqual(self.engine.state, WORK_STATE)
+        self.assertEqual(self.engine.remaining, 0)
+        self.assertEqual(self.engine.elapsed, 1)
+        self.assertEqual(self.loop.pending(), 0)
+
+
+class TimerEngineInterruptionTest(TimerEngineTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ended = []  # (事件, 结束的状态)
+        self.engine.subscribe(lambda event, engine: self.ended.append((event, engine.ended_state)))
+
+    def test_reset_while_running_records_state(self):
+        self.engine.start(60)
+        self.loop.advance(10)
+        self.engine.reset()
+        self.assertEqual(self.ended[-1], ("reset", WORK_STATE))
+        self.assertEqual(self.engine.elapsed, 10)
+
+    def test_reset_after_pause_is_not_another_interruption(self):
+        self.engine.start(60)
+        self.loop.advance(10)
+        self.engine.pause()
+        self.engine.reset()
+        interruptions = [event for event, state in self.ended if event in ("paused", "reset") and state]
+        self.assertEqual(interruptions, ["paused"])
+        self.assertEqual(self.engine.remaining, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
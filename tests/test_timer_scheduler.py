@@ -0,0 +1,182 @@
+import json
+import os
+import tempfile
+import unittest
+
+from fake_loop import FakeLoop
+from TimerScheduler import TimerScheduler
+
+
+class TimerSchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = FakeLoop()
+        self.wall_time = 1_700_000_000.0
+        self.scheduler = TimerScheduler(
+            self.loop.after, self.loop.after_cancel, clock=self.loop.clock, wall_clock=lambda: self.wall_time
+        )
+        self.fired = []
+        for kind in ("work", "rest", "long_rest"):
+            self.scheduler.register(kind, lambda name, payload, kind=kind: self.fired.append((kind, name, payload)))
+
+
+class TimerSchedulerOrderTest(TimerSchedulerTestCase):
+    def test_fires_in_deadline_order(self):
+        self.scheduler.add("c", 3, "work", "c")
+        self.scheduler.add("a", 1, "work", "a")
+        self.scheduler.add("b", 2, "work", "b")
+        self.scheduler.add("a2", 1, "rest", "a2")  # 与a同时到期, 按加入顺序
+        self.loop.advance(10)
+        self.assertEqual([payload for _, _, payload in self.fired], ["a", "a2", "b", "c"])
+
+    def test_single_wakeup_for_many_timers(self):
+        for i in range(100):
+            self.scheduler.add(f"t{i}", 100 - i, "work")
+        self.assertEqual(self.loop.pending(), 1)
+        self.loop.advance(100)
+        self.assertEqual(len(self.fired), 100)
+        self.assertEqual(self.loop.pending(), 0)
+
+    def test_steps_and_repeat(self):
+        self.scheduler.add("cycle", 25, "work", 1, steps=[("rest", 5, 2), ("long_rest", 15, 3)])
+        self.scheduler.add("tick", 10, "rest", "tick", repeat=10)
+        self.loop.advance(45)
+        self.scheduler.cancel("tick")
+        self.loop.advance(100)
+        self.assertEqual(
+            self.fired,
+            [
+                ("rest", "tick", "tick"),
+                ("rest", "tick", "tick"),
+                ("work", "cycle", 1),
+                ("rest", "tick", "tick"),
+                ("rest", "cycle", 2),
+                ("rest", "tick", "tick"),
+                ("long_rest", "cycle", 3),
+            ],
+        )
+        self.assertIsNone(self.scheduler.get("cycle"))
+
+
+class TimerSchedulerCancelTest(TimerSchedulerTestCase):
+    def test_cancelled_timer_is_skipped(self):
+        self.scheduler.add("a", 1, "work", "a")
+        self.scheduler.add("b", 2, "work", "b")
+        self.scheduler.cancel("a")
+        self.assertIsNone(self.scheduler.get("a"))
+        self.loop.advance(10)
+        self.assertEqual(self.fired, [("work", "b", "b")])
+
+    def test_lazy_cancel_rearms_for_next_timer(self):
+        self.scheduler.add("a", 1, "work")
+        self.scheduler.add("b", 5, "work")
+        self.scheduler.cancel("a")  # 只做标记, a的唤醒仍然保留
+        self.loop.advance(2)
+        self.assertEqual(self.fired, [])
+        self.assertEqual(self.loop.pending(), 1)  # 唤醒后跳过a, 为b安排唤醒
+        self.loop.advance(3)
+        self.assertEqual(self.fired, [("work", "b", None)])
+
+    def test_after_cancel(self):
+        calls = []
+        handle = self.scheduler.after(1000, lambda: calls.append("x"))
+        self.scheduler.after_cancel(handle)
+        self.loop.advance(2)
+        self.assertEqual(calls, [])
+
+    def test_replace_named_timer(self):
+        self.scheduler.add("a", 1, "work", "old")
+        self.scheduler.add("a", 2, "work", "new")
+        self.loop.advance(10)
+        self.assertEqual(self.fired, [("work", "a", "new")])
+
+
+class TimerSchedulerPersistTest(TimerSchedulerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "schedule.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def new_scheduler(self):
+        """模拟重启后的调度器, 单调时钟从新的值开始"""
+        loop = FakeLoop(now=5000.0)
+        scheduler = TimerScheduler(loop.after, loop.after_cancel, clock=loop.clock, wall_clock=lambda: self.wall_time)
+        fired = []
+        for kind in ("work", "rest", "long_rest"):
+            scheduler.register(kind, lambda name, payload, kind=kind: fired.append((kind, name, payload, loop.now)))
+        return loop, scheduler, fired
+
+    def test_save_skips_non_persistent_timers(self):
+        self.scheduler.add("cycle", 25, "work", 1)
+        self.scheduler.add("reminder", 300, "rest", persist=False)
+        self.scheduler.save(self.path)
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual([timer["name"] for timer in data["timers"]], ["cycle"])
+
+    def test_load_subtracts_downtime(self):
+        self.scheduler.add("cycle", 25, "work", 1, steps=[("rest", 5, 2)])
+        self.loop.advance(5)
+        self.scheduler.save(self.path)
+        self.wall_time += 10  # 关闭10秒
+        loop, scheduler, fired = self.new_scheduler()
+        scheduler.load(self.path)
+        self.assertEqual(scheduler.remaining("cycle"), 10)
+        loop.advance(20)
+        self.assertEqual(fired, [("work", "cycle", 1, 5010.0), ("rest", "cycle", 2, 5015.0)])
+
+    def test_load_runs_overdue_steps_in_order(self):
+        self.scheduler.add("cycle", 25, "work", 1, steps=[("rest", 5, 2), ("long_rest", 15, 3)])
+        self.scheduler.save(self.path)
+        self.wall_time += 32  # 关闭期间work和rest都已到期
+        loop, scheduler, fired = self.new_scheduler()
+        scheduler.load(self.path)
+        loop.advance(0.001)
+        self.assertEqual([(kind, payload) for kind, _, payload, _ in fired], [("work", 1), ("rest", 2)])
+        self.assertAlmostEqual(scheduler.remaining("cycle"), 13, places=2)
+
+    def test_load_repeat_fires_once_after_long_downtime(self):
+        self.scheduler.add("reminder", 300, "rest", "stretch", repeat=300)
+        self.loop.advance(200)
+        self.scheduler.save(self.path)
+        self.wall_time += 86400  # 关闭一天, 错过288次
+        loop, scheduler, fired = self.new_scheduler()
+        scheduler.load(self.path)
+        loop.advance(0.001)
+        self.assertEqual([(kind, payload) for kind, _, payload, _ in fired], [("rest", "stretch")])
+        # 仍按原来的节奏: 保存时还剩100秒, 一天是300秒的整数倍
+        self.assertAlmostEqual(scheduler.remaining("reminder"), 100, places=2)
+        loop.advance(100)
+        self.assertEqual(len(fired), 2)
+
+
+class TimerSchedulerDispatchTest(TimerSchedulerTestCase):
+    def test_timer_added_in_blocking_callback_fires(self):
+        """回调中添加定时器后阻塞(如弹窗wait_window), 新定时器仍然按时触发"""
+        reminders = []
+        self.scheduler.register("reminder", lambda name, payload: reminders.append(self.loop.now))
+
+        def popup():
+            self.scheduler.add("reminder", 300, "reminder", repeat=300, persist=False)
+            self.assertEqual(self.loop.pending(), 1)  # 回调返回前已安排唤醒
+            self.loop.advance(650)  # 弹窗等待期间事件循环继续运行
+            self.scheduler.cancel("reminder")
+
+        self.scheduler.after(1000, popup)
+        self.loop.advance(1)
+        self.assertEqual(reminders, [401.0, 701.0])
+        self.assertEqual(self.loop.pending(), 0)
+
+    def test_named_timer_added_in_handler_fires(self):
+        fired = []
+        self.scheduler.register("first", lambda name, payload: self.scheduler.add("second", 5, "second"))
+        self.scheduler.register("second", lambda name, payload: fired.append(self.loop.now))
+        self.scheduler.add("first", 1, "first")
+        self.loop.advance(10)
+        self.assertEqual(fired, [106.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
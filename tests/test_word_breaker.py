@@ -0,0 +1,26 @@
+import unittest
+
+from WordBreaker import WordBreaker
+
+WORDS = ["i", "is", "so", "open", "pen", "for", "mat", "format", "file", "system", "files", "read", "only", "a"]
+
+
+class WordBreakerTest(unittest.TestCase):
+    def test_fewer_pieces_win_over_lookup_counts(self):
+        breaker = WordBreaker(WORDS, {"i": 10**6, "so": 10**6, "pen": 10**6, "for": 10**6, "mat": 10**6})
+        self.assertEqual(breaker.split("isopen"), ("is", "open"))
+        self.assertEqual(breaker.split("formatfile"), ("format", "file"))
+
+    def test_lookup_counts_break_ties(self):
+        breaker = WordBreaker(WORDS + ["sys", "tem", "fil", "esystem"], {"system": 100})
+        self.assertEqual(breaker.split("filesystem"), ("file", "system"))
+        self.assertEqual(WordBreaker(["ab", "c", "a", "bc"], {"bc": 5}).split("abc"), ("a", "bc"))
+
+    def test_unsplittable(self):
+        breaker = WordBreaker(WORDS)
+        self.assertEqual(breaker.split("format"), ())  # 本身就是单词
+        self.assertEqual(breaker.split("readxonly"), ())
+
+
+if __name__ == "__main__":
+    unittest.main()